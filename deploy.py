@@ -4,15 +4,28 @@ Hetzner Cloud Server Deployment Tool
 A Python wrapper for the Hetzner Cloud CLI with interactive features
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import subprocess
 import argparse
 import json
-from typing import List, Dict, Optional, Tuple
+import re
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, List, Dict, Optional, Tuple, Union, overload
+if TYPE_CHECKING:
+    # Only needed by the annotations, which are never evaluated; typing.Literal is Python 3.8+
+    from typing import Literal
 from pathlib import Path
 import time
 
+# Catalog responses are cached here between runs
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'hetzner-cli-wrapper'
+
 # Color codes for terminal output
 class Colors:
     RED = '\033[31m'
@@ -25,134 +38,311 @@ class Colors:
     BOLD = '\033[1m'
     NC = '\033[0m'  # No Color
 
+# Status prefixes, built once instead of on every message
+_OK = f"{Colors.GREEN}✓{Colors.NC}"
+_ERR = f"{Colors.RED}✗{Colors.NC}"
+_WARN = f"{Colors.YELLOW}⚠{Colors.NC}"
+_ARROW = f"{Colors.YELLOW}→{Colors.NC}"
+
+# KEY=value lines, trimmed; comments, blank lines and invalid names are skipped (same rule as manage.py)
+_ENV_RE = re.compile(r'^(?![ \t]*#)[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+def _load_env_file(path: Path) -> Optional[Dict[str, str]]:
+    """KEY=value settings from a .env file, or None if the file does not exist"""
+    try:
+        return dict(_ENV_RE.findall(Path(path).read_text()))
+    except FileNotFoundError:
+        return None
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second with bursts of up to `burst`"""
+    
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now so waiting callers queue up in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
 class HetznerDeployer:
-    def __init__(self):
-        self.config = {}
+    # Seconds a fetched resource list stays valid within one process
+    METADATA_TTL = 300
+    # Catalog lists that change rarely enough to be cached on disk across runs
+    DISK_CACHED = ('image', 'server-type')
+    # Extra `list` flags that let the API filter before sending the payload
+    LIST_FLAGS = {'image': ['--type', 'system']}
+    # Hetzner allows 3600 requests per hour; pace hcloud calls to match
+    API_RATE = 1.0
+    API_BURST = 30
+    # Supported OS families and the default SSH user of each
+    _OS_RE = re.compile(r'ubuntu|debian|centos|almalinux|rocky|fedora|opensuse', re.IGNORECASE)
+    _SSH_USERS = {
+        'ubuntu': 'ubuntu',
+        'debian': 'debian',
+        'centos': 'centos',
+        'rocky': 'centos',
+        'almalinux': 'centos',
+        'fedora': 'fedora',
+        'opensuse': 'opensuse'
+    }
+    
+    def __init__(self) -> None:
+        self.config: Dict[str, str] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._env: Optional[Tuple[Optional[str], Dict[str, str]]] = None
+        self._meta_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        # Shared by all worker threads so parallel deploys stay under the API rate limit
+        self._bucket = TokenBucket(self.API_RATE, self.API_BURST)
+        # On-disk cache is off unless main() points it at a directory
+        self.cache_dir: Optional[Path] = None
+        self.cache_ttl: int = 86400
         self.load_env_config()
+        self.max_concurrency = self._max_concurrency()
+        # Caps in-flight mutating calls across all worker threads; reads are not limited
+        self._mutations = threading.BoundedSemaphore(self.max_concurrency)
         
-    def load_env_config(self):
+    def _max_concurrency(self) -> int:
+        """MAX_CONCURRENCY from the config, at least 1; falls back to 5 if it is not a number"""
+        value = self.config.get('MAX_CONCURRENCY', '5')
+        try:
+            return max(int(value), 1)
+        except ValueError:
+            print(f"{_WARN} Invalid MAX_CONCURRENCY '{value}', using 5")
+            return 5
+    
+    def load_env_config(self) -> None:
         """Load configuration from .env file"""
-        env_file = Path('.env')
-        if env_file.exists():
-            with open(env_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        self.config[key] = value
-            print(f"{Colors.GREEN}✓{Colors.NC} Loaded configuration from .env")
-        
-    def run_hcloud_command(self, cmd: List[str]) -> Tuple[bool, str]:
-        """Run hcloud command with proper token setup"""
-        env = os.environ.copy()
-        if 'HETZNER_TOKEN' in self.config:
-            env['HCLOUD_TOKEN'] = self.config['HETZNER_TOKEN']
-        
+        settings = _load_env_file(Path('.env'))
+        if settings is not None:
+            self.config.update(settings)
+            print(f"{_OK} Loaded configuration from .env")
+        
+    def _hcloud_env(self) -> Dict[str, str]:
+        """Environment for hcloud subprocesses, rebuilt only when the token changes"""
+        token = self.config.get('HETZNER_TOKEN')
+        if self._env is None or self._env[0] != token:
+            env = os.environ.copy()
+            if token is not None:
+                env['HCLOUD_TOKEN'] = token
+            self._env = (token, env)
+        return self._env[1]
+    
+    @overload
+    def run_hcloud_command(self, cmd: List[str], decode: Literal[True] = ...) -> Tuple[bool, str]: ...
+    @overload
+    def run_hcloud_command(self, cmd: List[str], decode: Literal[False]) -> Tuple[bool, bytes]: ...
+    def run_hcloud_command(self, cmd: List[str], decode: bool = True) -> Tuple[bool, Union[str, bytes]]:
+        """Run hcloud command with proper token setup (raw bytes output if decode is False)"""
         try:
             result = subprocess.run(
                 ['hcloud'] + cmd,
                 capture_output=True,
-                text=True,
-                env=env
+                env=self._hcloud_env()
             )
-            return result.returncode == 0, result.stdout.strip()
+            # json.loads takes bytes directly, so JSON callers skip the decode
+            output = result.stdout.strip()
+            return result.returncode == 0, output.decode('utf-8', 'replace') if decode else output
         except subprocess.CalledProcessError as e:
-            return False, str(e)
+            error = str(e)
         except FileNotFoundError:
-            return False, "hcloud CLI not found"
+            error = "hcloud CLI not found"
+        return False, error if decode else error.encode()
+    
+    def _read(self, cmd: List[str]) -> Tuple[bool, bytes]:
+        """Run a read-only hcloud command for its raw output; safe to issue from any number of threads"""
+        self._bucket.acquire()
+        return self.run_hcloud_command(cmd, decode=False)
+    
+    def _mutate(self, cmd: List[str]) -> Tuple[bool, str]:
+        """Run an hcloud command that changes resources, bounded by MAX_CONCURRENCY"""
+        with self._mutations:
+            self._bucket.acquire()
+            return self.run_hcloud_command(cmd)
     
     def check_dependencies(self) -> bool:
         """Check if hcloud CLI is available"""
         success, _ = self.run_hcloud_command(['version'])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} hcloud CLI is available")
+            print(f"{_OK} hcloud CLI is available")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} hcloud CLI not found. Please install it first.")
+            print(f"{_ERR} hcloud CLI not found. Please install it first.")
             return False
     
     def validate_token(self) -> bool:
         """Validate Hetzner Cloud API token"""
         if 'HETZNER_TOKEN' not in self.config or not self.config['HETZNER_TOKEN']:
-            print(f"{Colors.RED}✗{Colors.NC} Hetzner Cloud API token is required")
+            print(f"{_ERR} Hetzner Cloud API token is required")
             print("Set HETZNER_TOKEN in .env file or use --token option")
             return False
         
         success, _ = self.run_hcloud_command(['context', 'list'])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} API token is valid")
+            print(f"{_OK} API token is valid")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Invalid Hetzner Cloud API token")
+            print(f"{_ERR} Invalid Hetzner Cloud API token")
             return False
     
-    def get_server_types(self, location: str = None) -> List[str]:
+    def _list_json(self, resource: str) -> Optional[List[Dict]]:
+        """Get the parsed `hcloud <resource> list -o json` output, cached for METADATA_TTL"""
+        # Concurrent callers for the same resource wait for one fetch instead of racing
+        with self._fetch_locks.setdefault(resource, threading.Lock()):
+            cached = self._meta_cache.get(resource)
+            if cached and time.monotonic() - cached[0] < self.METADATA_TTL:
+                return cached[1]
+            
+            data = self._read_disk_cache(resource)
+            if data is None:
+                success, output = self._read(self._list_cmd(resource))
+                if not success:
+                    return None
+                data = json.loads(output)
+                self._write_disk_cache(resource, output)
+            self._meta_cache[resource] = (time.monotonic(), data)
+            return data
+    
+    def _list_cmd(self, resource: str) -> List[str]:
+        """The `hcloud <resource> list` argv used to fetch a resource list"""
+        return [resource, 'list', *self.LIST_FLAGS.get(resource, ()), '-o', 'json']
+    
+    def _disk_cache_path(self, resource: str) -> Optional[Path]:
+        """Cache file for a resource list, keyed by the full list command and API token"""
+        if self.cache_dir is None or resource not in self.DISK_CACHED:
+            return None
+        key = '\0'.join([*self._list_cmd(resource), self.config.get('HETZNER_TOKEN', '')]).encode()
+        return self.cache_dir / f"{hashlib.blake2b(key, digest_size=16).hexdigest()}.json"
+    
+    def _read_disk_cache(self, resource: str) -> Optional[List[Dict]]:
+        """Load a resource list from the on-disk cache if it is younger than cache_ttl"""
+        path = self._disk_cache_path(resource)
+        if path is None:
+            return None
+        try:
+            if time.time() - path.stat().st_mtime < self.cache_ttl:
+                return json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def _write_disk_cache(self, resource: str, output: bytes) -> None:
+        """Store a raw resource list response in the on-disk cache"""
+        path = self._disk_cache_path(resource)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(output)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    
+    def get_server_types(self, location: Optional[str] = None) -> List[str]:
         """Get available server types, optionally filtered by location"""
-        success, output = self.run_hcloud_command(['server-type', 'list', '-o', 'json'])
-        if success:
-            data = json.loads(output)
-            server_types = []
-            for item in data:
-                # If location is specified, check if server type is available in that location
-                if location:
-                    # Get available locations for this server type
-                    available_locations = [loc['location'] for loc in item.get('prices', [])]
-                    if location in available_locations:
-                        server_types.append(item['name'])
-                else:
-                    server_types.append(item['name'])
-            return server_types
+        data = self._list_json('server-type')
+        if data is not None:
+            # A server type is available in a location if it has a price there
+            return [
+                item['name'] for item in data
+                if not location or any(price['location'] == location for price in item.get('prices', ()))
+            ]
         return []
     
     def get_images(self) -> List[str]:
         """Get available images"""
-        success, output = self.run_hcloud_command(['image', 'list', '-o', 'json'])
-        if success:
-            data = json.loads(output)
+        data = self._list_json('image')
+        if data is not None:
             # Filter for system images only (not user snapshots) and deduplicate
             images = set()  # Use set to automatically deduplicate
             for item in data:
                 # Only include system images (type: 'system'), not user snapshots
-                if item.get('type') == 'system':
-                    name = item['name']
-                    if any(os_name in name.lower() for os_name in 
-                          ['ubuntu', 'debian', 'centos', 'almalinux', 'rocky', 'fedora', 'opensuse']):
-                        images.add(name)
+                if item.get('type') == 'system' and self._OS_RE.search(item['name']):
+                    images.add(item['name'])
             return sorted(list(images))  # Convert back to sorted list
         return []
     
     def get_locations(self) -> List[str]:
-        """Get available locations"""
-        success, output = self.run_hcloud_command(['location', 'list', '-o', 'json'])
-        if success:
-            data = json.loads(output)
-            return [item['name'] for item in data]
+        """Get available locations, derived from the server type price list"""
+        # Server types carry a price per location they are offered in, so the
+        # same cached response that drives get_server_types yields the
+        # locations without a separate `location list` call
+        data = self._list_json('server-type')
+        if data is not None:
+            return list(dict.fromkeys(price['location'] for item in data for price in item.get('prices', [])))
         return []
     
     def get_ssh_keys(self) -> List[str]:
         """Get available SSH keys"""
-        success, output = self.run_hcloud_command(['ssh-key', 'list', '-o', 'json'])
-        if success:
-            data = json.loads(output)
+        data = self._list_json('ssh-key')
+        if data is not None:
             return [item['name'] for item in data]
         return []
     
     def get_firewalls(self) -> List[str]:
         """Get available firewalls"""
-        success, output = self.run_hcloud_command(['firewall', 'list', '-o', 'json'])
-        if success:
-            data = json.loads(output)
+        data = self._list_json('firewall')
+        if data is not None:
             return [item['name'] for item in data]
         return []
     
     def get_networks(self) -> List[str]:
         """Get available networks"""
-        success, output = self.run_hcloud_command(['network', 'list', '-o', 'json'])
-        if success:
-            data = json.loads(output)
+        data = self._list_json('network')
+        if data is not None:
             return [item['name'] for item in data]
         return []
     
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run a call on the shared background worker pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=6)
+        return self._executor.submit(fn, *args)
+    
+    def close(self) -> None:
+        """Shut down the background worker pool, dropping prefetches nobody waited for"""
+        if self._executor is None:
+            return
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+    
+    def prefetch_metadata(self, args: argparse.Namespace) -> Dict[str, Future]:
+        """Start fetching every list interactive_config will prompt from"""
+        fetchers = {}
+        if not args.image:
+            fetchers['images'] = self.get_images
+        if args.interactive:
+            if not args.location:
+                fetchers['locations'] = self.get_locations
+            if not args.server_type:
+                # Warms the cache; the list is filtered once a location is chosen
+                fetchers['server_types'] = self.get_server_types
+            if not args.ssh_key:
+                fetchers['ssh_keys'] = self.get_ssh_keys
+            if not args.firewall:
+                fetchers['firewalls'] = self.get_firewalls
+            if not args.network:
+                fetchers['networks'] = self.get_networks
+        return {key: self._submit(fetch) for key, fetch in fetchers.items()}
+    
     def select_from_list(self, prompt: str, options: List[str], allow_none: bool = False) -> Optional[str]:
         """Interactive selection from a list of options"""
         if not options:
@@ -167,31 +357,43 @@ class HetznerDeployer:
         for i, option in enumerate(options, 1):
             print(f"  {i}. {option}")
         
+        max_choice = len(options) + (1 if allow_none else 0)
+        valid = frozenset(range(0 if allow_none else 1, len(options) + 1))
         while True:
             try:
-                max_choice = len(options) + (1 if allow_none else 0)
                 choice = input(f"\nSelect option (0-{max_choice} or 1-{len(options)}): ").strip()
-                
-                if not choice:
-                    continue
-                    
-                choice_num = int(choice)
-                
-                if allow_none and choice_num == 0:
-                    return None
-                elif 1 <= choice_num <= len(options):
-                    return options[choice_num - 1]
-                else:
-                    print(f"{Colors.RED}Invalid selection. Please choose 1-{len(options)}{Colors.NC}")
-            except ValueError:
-                print(f"{Colors.RED}Please enter a valid number{Colors.NC}")
             except KeyboardInterrupt:
                 print(f"\n{Colors.YELLOW}Operation cancelled{Colors.NC}")
                 sys.exit(0)
+            
+            if not choice:
+                continue
+            if not choice.isdecimal():
+                print(f"{Colors.RED}Please enter a valid number{Colors.NC}")
+                continue
+            
+            choice_num = int(choice)
+            if choice_num not in valid:
+                print(f"{Colors.RED}Invalid selection. Please choose 1-{len(options)}{Colors.NC}")
+            elif choice_num == 0:
+                return None
+            else:
+                return options[choice_num - 1]
+    
+    @staticmethod
+    def _derive_names(base: str, count: int) -> List[str]:
+        """Name a single server `base`, or a fleet base-001, base-002, ..."""
+        if count == 1:
+            return [base]
+        return [f"{base}-{i:03d}" for i in range(1, count + 1)]
     
-    def interactive_config(self, args) -> Dict:
+    def interactive_config(self, args: argparse.Namespace, prefetched: Optional[Dict[str, Future]] = None) -> Optional[Dict[str, Any]]:
         """Interactive configuration for missing values"""
-        config = {}
+        config: Dict[str, Any] = {}
+        
+        # Fetch all lists up front so the API calls overlap with the prompts
+        if prefetched is None:
+            prefetched = self.prefetch_metadata(args)
         
         print(f"{Colors.BLUE}Interactive Configuration{Colors.NC}")
         print("=" * 25)
@@ -240,7 +442,7 @@ class HetznerDeployer:
                             base_name = input("Enter base server name: ").strip()
                             if base_name:
                                 config['name'] = base_name
-                                config['server_names'] = [f"{base_name}-{i:03d}" for i in range(1, config['count'] + 1)]
+                                config['server_names'] = self._derive_names(base_name, config['count'])
                                 break
                             print(f"{Colors.RED}Base name is required{Colors.NC}")
                         break
@@ -262,15 +464,12 @@ class HetznerDeployer:
                         print(f"{Colors.RED}Please enter 1 or 2{Colors.NC}")
         else:
             config['name'] = args.name
-            if config['count'] == 1:
-                config['server_names'] = [args.name]
-            else:
-                config['server_names'] = [f"{args.name}-{i:03d}" for i in range(1, config['count'] + 1)]
+            config['server_names'] = self._derive_names(args.name, config['count'])
         
         # Image selection
         if not args.image:
-            print(f"{Colors.YELLOW}→{Colors.NC} Fetching available images...")
-            images = self.get_images()
+            print(f"{_ARROW} Fetching available images...")
+            images = prefetched['images'].result()
             if images:
                 config['image'] = self.select_from_list("Select image:", images)
             else:
@@ -283,8 +482,8 @@ class HetznerDeployer:
         if not args.location:
             location = self.config.get('DEFAULT_LOCATION', 'nbg1')
             if args.interactive:
-                print(f"{Colors.YELLOW}→{Colors.NC} Fetching available locations...")
-                locations = self.get_locations()
+                print(f"{_ARROW} Fetching available locations...")
+                locations = prefetched['locations'].result()
                 if locations:
                     selected = self.select_from_list(f"Select location (current: {location}):", locations)
                     config['location'] = selected or location
@@ -299,7 +498,7 @@ class HetznerDeployer:
         if not args.server_type:
             server_type = self.config.get('DEFAULT_SERVER_TYPE', 'cpx11')
             if args.interactive:
-                print(f"{Colors.YELLOW}→{Colors.NC} Fetching available server types for {config['location']}...")
+                print(f"{_ARROW} Fetching available server types for {config['location']}...")
                 types = self.get_server_types(config['location'])
                 if types:
                     selected = self.select_from_list(f"Select server type (current: {server_type}):", types)
@@ -315,8 +514,8 @@ class HetznerDeployer:
         if not args.ssh_key:
             ssh_key = self.config.get('DEFAULT_SSH_KEY_NAME', '')
             if args.interactive:
-                print(f"{Colors.YELLOW}→{Colors.NC} Fetching available SSH keys...")
-                keys = self.get_ssh_keys()
+                print(f"{_ARROW} Fetching available SSH keys...")
+                keys = prefetched['ssh_keys'].result()
                 if keys:
                     keys.append("Upload new SSH key")
                     selected = self.select_from_list("Select SSH key:", keys)
@@ -347,8 +546,8 @@ class HetznerDeployer:
         
         # Firewall
         if args.interactive and not args.firewall:
-            print(f"{Colors.YELLOW}→{Colors.NC} Fetching available firewalls...")
-            firewalls = self.get_firewalls()
+            print(f"{_ARROW} Fetching available firewalls...")
+            firewalls = prefetched['firewalls'].result()
             if firewalls:
                 config['firewall'] = self.select_from_list("Select firewall:", firewalls, allow_none=True)
         else:
@@ -356,8 +555,8 @@ class HetznerDeployer:
         
         # Network
         if args.interactive and not args.network:
-            print(f"{Colors.YELLOW}→{Colors.NC} Fetching available networks...")
-            networks = self.get_networks()
+            print(f"{_ARROW} Fetching available networks...")
+            networks = prefetched['networks'].result()
             if networks:
                 config['network'] = self.select_from_list("Select network:", networks, allow_none=True)
         else:
@@ -376,6 +575,8 @@ class HetznerDeployer:
             config['cloud_config'] = cloud_config
         else:
             config['cloud_config'] = args.cloud_config
+        # Stat the file once here rather than once per deployed server
+        config['cloud_config_exists'] = bool(config['cloud_config']) and os.path.exists(config['cloud_config'])
         
         config['dry_run'] = args.dry_run
         
@@ -391,7 +592,7 @@ class HetznerDeployer:
         """Create a volume for the server"""
         volume_name = f"{server_name}-volume"
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Creating volume: {volume_name} ({volume_size}GB)")
+        print(f"{_ARROW} Creating volume: {volume_name} ({volume_size}GB)")
         
         cmd = [
             'volume', 'create',
@@ -405,23 +606,34 @@ class HetznerDeployer:
             print(f"{Colors.BLUE}[DRY RUN]{Colors.NC} Would create volume: hcloud {' '.join(cmd)}")
             return volume_name
         
-        success, output = self.run_hcloud_command(cmd)
+        success, output = self._mutate(cmd)
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Volume created successfully: {volume_name}")
+            print(f"{_OK} Volume created successfully: {volume_name}")
             return volume_name
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to create volume: {output}")
+            print(f"{_ERR} Failed to create volume: {output}")
             return None
     
-    def upload_ssh_key(self, server_name: str, key_file: str, dry_run: bool) -> Optional[str]:
-        """Upload SSH key from file"""
-        if not os.path.exists(key_file):
-            print(f"{Colors.RED}✗{Colors.NC} SSH key file not found: {key_file}")
+    def upload_ssh_key(self, key_file: str, dry_run: bool) -> Optional[str]:
+        """Upload SSH key from file, reusing an already uploaded copy of the same key"""
+        try:
+            with open(key_file, 'r') as f:
+                public_key = f.read().strip()
+        except OSError:
+            print(f"{_ERR} SSH key file not found: {key_file}")
             return None
         
-        key_name = f"{server_name}-key-{int(time.time())}"
+        # Compare key type and data only; the trailing comment may differ between copies
+        key_parts = public_key.split()[:2]
+        for item in self._list_json('ssh-key') or ():
+            if item.get('public_key', '').split()[:2] == key_parts:
+                print(f"{_OK} SSH key already uploaded: {item['name']}")
+                return item['name']
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Uploading SSH key: {key_name}")
+        # Named by key content only, so every run and every server agrees on the name
+        key_name = f"deploy-key-{hashlib.sha256(' '.join(key_parts).encode()).hexdigest()[:12]}"
+        
+        print(f"{_ARROW} Uploading SSH key: {key_name}")
         
         cmd = [
             'ssh-key', 'create',
@@ -433,14 +645,54 @@ class HetznerDeployer:
             print(f"{Colors.BLUE}[DRY RUN]{Colors.NC} Would upload SSH key: hcloud {' '.join(cmd)}")
             return key_name
         
-        success, output = self.run_hcloud_command(cmd)
+        success, output = self._mutate(cmd)
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} SSH key uploaded successfully: {key_name}")
+            self._meta_cache.pop('ssh-key', None)
+            print(f"{_OK} SSH key uploaded successfully: {key_name}")
             return key_name
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to upload SSH key: {output}")
+            print(f"{_ERR} Failed to upload SSH key: {output}")
             return None
     
+    def _wait_for_server(self, server_name: str, timeout: float = 120) -> Optional[Dict]:
+        """Poll server details with exponential backoff until the server is running"""
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        while True:
+            success, info = self._read(['server', 'describe', server_name, '-o', 'json'])
+            if success:
+                try:
+                    server_data = json.loads(info)
+                except json.JSONDecodeError:
+                    server_data = None
+                if server_data and server_data.get('status') == 'running':
+                    return server_data
+            
+            if time.monotonic() + delay > deadline:
+                return None
+            time.sleep(delay)
+            delay = min(delay * 2, 5)
+    
+    @staticmethod
+    def _server_ips(server_data: Dict) -> Tuple[str, str]:
+        """Public IPv4 and first private IP of a server, 'N/A' where missing"""
+        try:
+            public_ip = server_data['public_net']['ipv4']['ip']
+        except (KeyError, TypeError):
+            public_ip = 'N/A'
+        private_net = server_data.get('private_net') or []
+        try:
+            private_ip = private_net[0]['ip']
+        except (KeyError, IndexError, TypeError):
+            private_ip = 'N/A'
+        return public_ip, private_ip
+    
+    @classmethod
+    def _detect_ssh_user(cls, image_name: str) -> str:
+        """Default SSH user for an image, 'root' for unrecognised operating systems"""
+        os_match = cls._OS_RE.search(image_name)
+        return cls._SSH_USERS[os_match.group().lower()] if os_match else 'root'
+    
     def deploy_server(self, server_name: str, config: Dict) -> bool:
         """Deploy a single server"""
         cmd = [
@@ -448,7 +700,8 @@ class HetznerDeployer:
             '--name', server_name,
             '--type', config['server_type'],
             '--image', config['image'],
-            '--location', config['location']
+            '--location', config['location'],
+            '-o', 'json'
         ]
         
         # Add SSH key
@@ -473,87 +726,101 @@ class HetznerDeployer:
             cmd.extend(['--label', converted_tags])
         
         # Add cloud-init config
-        if config.get('cloud_config') and os.path.exists(config['cloud_config']):
+        cloud_config_exists = config.get('cloud_config_exists')
+        if cloud_config_exists is None:
+            cloud_config_exists = bool(config.get('cloud_config')) and os.path.exists(config['cloud_config'])
+        if cloud_config_exists:
             cmd.extend(['--user-data-from-file', config['cloud_config']])
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Deploying server: {server_name}")
+        print(f"{_ARROW} Deploying server: {server_name}")
         print(f"{Colors.BLUE}Command:{Colors.NC} hcloud {' '.join(cmd)}")
         
         if config['dry_run']:
             print(f"{Colors.BLUE}[DRY RUN]{Colors.NC} Would execute: hcloud {' '.join(cmd)}")
             return True
         
-        success, output = self.run_hcloud_command(cmd)
+        success, output = self._mutate(cmd)
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Server deployed successfully: {server_name}")
-            
-            # Wait for server to be ready and get IP
-            print(f"{Colors.YELLOW}→{Colors.NC} Waiting for server to be ready...")
-            time.sleep(3)
+            print(f"{_OK} Server deployed successfully: {server_name}")
             
-            # Get server info with JSON output for parsing
-            success, info = self.run_hcloud_command(['server', 'describe', server_name, '-o', 'json'])
-            if success:
-                try:
-                    server_data = json.loads(info)
-                    public_ip = server_data.get('public_net', {}).get('ipv4', {}).get('ip', 'N/A')
-                    private_ip = server_data.get('private_net', [{}])[0].get('ip', 'N/A') if server_data.get('private_net') else 'N/A'
-                    
-                    print(f"\n{Colors.GREEN}🎉 Deployment Complete!{Colors.NC}")
-                    print("=" * 25)
-                    print(f"{Colors.BLUE}Server:{Colors.NC} {server_name}")
-                    print(f"{Colors.BLUE}Public IP:{Colors.NC} {public_ip}")
-                    if private_ip != 'N/A':
-                        print(f"{Colors.BLUE}Private IP:{Colors.NC} {private_ip}")
-                    print(f"{Colors.BLUE}Location:{Colors.NC} {config['location']}")
-                    print(f"{Colors.BLUE}Type:{Colors.NC} {config['server_type']}")
-                    print(f"{Colors.BLUE}Image:{Colors.NC} {config['image']}")
+            # The create response already includes the server's addresses
+            try:
+                server_data = json.loads(output).get('server')
+            except (json.JSONDecodeError, AttributeError):
+                server_data = None
+            if not server_data:
+                # Fall back to polling when the response can't be used
+                print(f"{_ARROW} Waiting for server to be ready...")
+                server_data = self._wait_for_server(server_name)
+            if server_data:
+                public_ip, private_ip = self._server_ips(server_data)
+                
+                lines = [
+                    f"\n{Colors.GREEN}🎉 Deployment Complete!{Colors.NC}",
+                    "=" * 25,
+                    f"{Colors.BLUE}Server:{Colors.NC} {server_name}",
+                    f"{Colors.BLUE}Public IP:{Colors.NC} {public_ip}",
+                ]
+                if private_ip != 'N/A':
+                    lines.append(f"{Colors.BLUE}Private IP:{Colors.NC} {private_ip}")
+                lines += [
+                    f"{Colors.BLUE}Location:{Colors.NC} {config['location']}",
+                    f"{Colors.BLUE}Type:{Colors.NC} {config['server_type']}",
+                    f"{Colors.BLUE}Image:{Colors.NC} {config['image']}",
+                ]
+                
+                # SSH connection commands
+                if public_ip != 'N/A':
+                    # Determine default user based on image
+                    default_user = self._detect_ssh_user(config['image'])
                     
-                    # SSH connection commands
-                    if public_ip != 'N/A':
-                        print(f"\n{Colors.CYAN}🔗 SSH Connection Commands:{Colors.NC}")
-                        print("=" * 30)
-                        
-                        # Determine default user based on image
-                        default_user = 'root'
-                        image_lower = config['image'].lower()
-                        if 'ubuntu' in image_lower:
-                            default_user = 'ubuntu'
-                        elif 'debian' in image_lower:
-                            default_user = 'debian'
-                        elif 'centos' in image_lower or 'rocky' in image_lower or 'almalinux' in image_lower:
-                            default_user = 'centos'
-                        elif 'fedora' in image_lower:
-                            default_user = 'fedora'
-                        elif 'opensuse' in image_lower:
-                            default_user = 'opensuse'
-                        
-                        print(f"{Colors.YELLOW}# Direct SSH (using default user):{Colors.NC}")
-                        print(f"ssh {default_user}@{public_ip}")
-                        
-                        print(f"\n{Colors.YELLOW}# SSH with custom user:{Colors.NC}")
-                        print(f"ssh your_username@{public_ip}")
-                        
-                        print(f"\n{Colors.YELLOW}# SSH with specific key file:{Colors.NC}")
-                        print(f"ssh -i ~/.ssh/your_key {default_user}@{public_ip}")
-                        
-                        print(f"\n{Colors.YELLOW}# Using Hetzner CLI (if configured):{Colors.NC}")
-                        print(f"python3 manage.py ssh {server_name}")
-                        
-                        print(f"\n{Colors.GREEN}💡 Tip:{Colors.NC} Server may take 1-2 minutes to fully boot and accept SSH connections")
-                        
-                except json.JSONDecodeError:
-                    print(f"{Colors.BLUE}Server details:{Colors.NC}")
-                    print(info)
+                    lines += [
+                        f"\n{Colors.CYAN}🔗 SSH Connection Commands:{Colors.NC}",
+                        "=" * 30,
+                        f"{Colors.YELLOW}# Direct SSH (using default user):{Colors.NC}",
+                        f"ssh {default_user}@{public_ip}",
+                        f"\n{Colors.YELLOW}# SSH with custom user:{Colors.NC}",
+                        f"ssh your_username@{public_ip}",
+                        f"\n{Colors.YELLOW}# SSH with specific key file:{Colors.NC}",
+                        f"ssh -i ~/.ssh/your_key {default_user}@{public_ip}",
+                        f"\n{Colors.YELLOW}# Using Hetzner CLI (if configured):{Colors.NC}",
+                        f"python3 manage.py ssh {server_name}",
+                        f"\n{Colors.GREEN}💡 Tip:{Colors.NC} Server may take 1-2 minutes to fully boot and accept SSH connections",
+                    ]
+                
+                # One write keeps the block together when servers deploy in parallel
+                sys.stdout.write('\n'.join(lines) + '\n')
             else:
-                print(f"{Colors.YELLOW}⚠{Colors.NC} Server deployed but couldn't retrieve details")
+                print(f"{_WARN} Server deployed but couldn't retrieve details")
             
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to deploy server: {output}")
+            print(f"{_ERR} Failed to deploy server: {output}")
             return False
     
-    def deploy(self, args):
+    def _deploy_one(self, index: int, server_name: str, config: Dict) -> bool:
+        """Create the volume (if requested) and server for one member of the fleet"""
+        rule = f"{Colors.PURPLE}{'=' * 39}{Colors.NC}"
+        sys.stdout.write(f"{rule}\n{Colors.BLUE}Deploying server {index}/{config['count']}: {server_name}{Colors.NC}\n{rule}\n")
+        
+        # Create volume if needed
+        if config['volume_size'] > 0:
+            volume_name = self.create_volume(server_name, config['volume_size'], config['location'], config['dry_run'])
+            if not volume_name:
+                print(f"{_ERR} Failed to create volume for {server_name}")
+                return False
+            # Each server gets its own copy so concurrent deploys don't share volume names
+            config = {**config, 'volume_name': volume_name}
+        
+        # Deploy server
+        deployed = self.deploy_server(server_name, config)
+        if deployed:
+            sys.stdout.write(f"{_OK} Server {index}/{config['count']} deployed successfully!\n\n")
+        else:
+            sys.stdout.write(f"{_ERR} Failed to deploy server {index}/{config['count']}\n\n")
+        return deployed
+    
+    def deploy(self, args: argparse.Namespace) -> bool:
         """Main deployment function"""
         # Check dependencies
         if not self.check_dependencies():
@@ -562,8 +829,11 @@ class HetznerDeployer:
         if not self.validate_token():
             return False
         
+        # Start fetching catalog data in the background before the first prompt
+        prefetched = self.prefetch_metadata(args)
+        
         # Get configuration
-        config = self.interactive_config(args)
+        config = self.interactive_config(args, prefetched)
         if not config:
             return False
         
@@ -588,36 +858,18 @@ class HetznerDeployer:
         
         # Handle SSH key upload if needed
         if config.get('ssh_key_file'):
-            uploaded_key = self.upload_ssh_key(config['name'], config['ssh_key_file'], config['dry_run'])
+            uploaded_key = self.upload_ssh_key(config['ssh_key_file'], config['dry_run'])
             if uploaded_key:
                 config['ssh_key'] = uploaded_key
             else:
                 return False
         
-        # Deploy servers
-        success_count = 0
-        for i, server_name in enumerate(config['server_names']):
-            print(f"{Colors.PURPLE}{'=' * 39}{Colors.NC}")
-            print(f"{Colors.BLUE}Deploying server {i+1}/{config['count']}: {server_name}{Colors.NC}")
-            print(f"{Colors.PURPLE}{'=' * 39}{Colors.NC}")
-            
-            # Create volume if needed
-            if config['volume_size'] > 0:
-                volume_name = self.create_volume(server_name, config['volume_size'], config['location'], config['dry_run'])
-                if volume_name:
-                    config['volume_name'] = volume_name
-                else:
-                    print(f"{Colors.RED}✗{Colors.NC} Failed to create volume for {server_name}")
-                    continue
-            
-            # Deploy server
-            if self.deploy_server(server_name, config):
-                success_count += 1
-                print(f"{Colors.GREEN}✓{Colors.NC} Server {i+1}/{config['count']} deployed successfully!")
-            else:
-                print(f"{Colors.RED}✗{Colors.NC} Failed to deploy server {i+1}/{config['count']}")
-            
-            print()
+        # Deploy servers concurrently, at most MAX_CONCURRENCY at a time
+        max_workers = min(self.max_concurrency, config['count'])
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+            results = pool.map(self._deploy_one, range(1, config['count'] + 1),
+                               config['server_names'], [config] * config['count'])
+            success_count = sum(results)
         
         # Final summary
         if not config['dry_run']:
@@ -642,7 +894,7 @@ class HetznerDeployer:
         
         return success_count == config['count']
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(
         description='Hetzner Cloud Server Deployment Tool',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -677,6 +929,9 @@ Examples:
     # Mode options
     parser.add_argument('--interactive', action='store_true', help='Interactive mode')
     parser.add_argument('--dry-run', action='store_true', help='Show commands without executing')
+    parser.add_argument('--no-cache', action='store_true', help='Always fetch images and server types from the API')
+    parser.add_argument('--cache-ttl', type=int, default=86400,
+                        help='Seconds to reuse cached images and server types (default: 86400)')
     
     args = parser.parse_args()
     
@@ -684,6 +939,9 @@ Examples:
     deployer = HetznerDeployer()
     if args.token:
         deployer.config['HETZNER_TOKEN'] = args.token
+    if not args.no_cache:
+        deployer.cache_dir = CACHE_DIR
+        deployer.cache_ttl = args.cache_ttl
     
     # Check if we need interactive mode
     if args.interactive or not args.name or not args.image:
@@ -698,6 +956,8 @@ Examples:
     except Exception as e:
         print(f"{Colors.RED}Error: {e}{Colors.NC}")
         sys.exit(1)
+    finally:
+        deployer.close()
 
 if __name__ == '__main__':
     main()
@@ -4,13 +4,27 @@ Hetzner Cloud Server Management Tool
 A Python wrapper for managing Hetzner Cloud resources
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import subprocess
 import argparse
 import json
-from typing import List, Dict, Optional, Tuple
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple, Union, overload
+if TYPE_CHECKING:
+    # Only needed by the annotations, which are never evaluated; typing.Literal is Python 3.8+
+    from typing import Literal
 from pathlib import Path
+import time
+
+# orjson parses large server lists several times faster; fall back to the stdlib parser
+try:
+    import orjson as _json
+except ImportError:
+    _json = json  # type: ignore[misc]
 
 # Color codes for terminal output
 class Colors:
@@ -24,67 +38,122 @@ class Colors:
     BOLD = '\033[1m'
     NC = '\033[0m'  # No Color
 
+# Plain output when NO_COLOR is set or stdout is not a terminal
+if os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+    for _name in [name for name in vars(Colors) if name.isupper()]:
+        setattr(Colors, _name, '')
+    del _name
+
+# Status prefixes, built once instead of on every message
+_OK = f"{Colors.GREEN}✓{Colors.NC}"
+_ERR = f"{Colors.RED}✗{Colors.NC}"
+_WARN = f"{Colors.YELLOW}⚠{Colors.NC}"
+_ARROW = f"{Colors.YELLOW}→{Colors.NC}"
+
 class HetznerManager:
-    def __init__(self):
-        self.config = {}
+    # KEY=value lines of a .env file, trimmed; comments and invalid names never match (same rule as deploy.py)
+    _ENV_RE = re.compile(r'^(?![ \t]*#)[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+    # Seconds a fetched server list is reused by later lookups on the same manager
+    SERVER_LIST_TTL = 10
+    
+    def __init__(self) -> None:
+        self.config: Dict[str, str] = {}
+        # (fetched_at, parsed `server list` output), dropped whenever a server changes
+        self._server_cache: Optional[Tuple[float, List[Dict]]] = None
+        self._env: Optional[Tuple[Optional[str], Dict[str, str]]] = None
         self.load_env_config()
         
-    def load_env_config(self):
+    def load_env_config(self) -> None:
         """Load configuration from .env file"""
         env_file = Path('.env')
         if env_file.exists():
-            with open(env_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        self.config[key] = value
-            print(f"{Colors.GREEN}✓{Colors.NC} Loaded configuration from .env")
-        
-    def run_hcloud_command(self, cmd: List[str]) -> Tuple[bool, str]:
-        """Run hcloud command with proper token setup"""
-        env = os.environ.copy()
-        if 'HETZNER_TOKEN' in self.config:
-            env['HCLOUD_TOKEN'] = self.config['HETZNER_TOKEN']
+            self.config.update(self._ENV_RE.findall(env_file.read_text()))
+            print(f"{_OK} Loaded configuration from .env")
         
+    def _hcloud_env(self) -> Dict[str, str]:
+        """Environment for hcloud subprocesses, rebuilt only when the token changes"""
+        token = self.config.get('HETZNER_TOKEN')
+        if self._env is None or self._env[0] != token:
+            env = os.environ.copy()
+            if token is not None:
+                env['HCLOUD_TOKEN'] = token
+            self._env = (token, env)
+        return self._env[1]
+    
+    @overload
+    def run_hcloud_command(self, cmd: List[str], decode: Literal[True] = ...) -> Tuple[bool, str]: ...
+    @overload
+    def run_hcloud_command(self, cmd: List[str], decode: Literal[False]) -> Tuple[bool, bytes]: ...
+    def run_hcloud_command(self, cmd: List[str], decode: bool = True) -> Tuple[bool, Union[str, bytes]]:
+        """Run hcloud command with proper token setup (raw bytes output if decode is False)"""
         try:
             result = subprocess.run(
-                ['hcloud'] + cmd,
+                ['hcloud', *cmd],
                 capture_output=True,
-                text=True,
-                env=env
+                env=self._hcloud_env()
             )
-            return result.returncode == 0, result.stdout.strip()
+            # hcloud reports errors such as an invalid token on stderr
+            output = result.stdout.strip() if result.returncode == 0 else (result.stdout.strip() or result.stderr.strip())
+            # JSON callers parse the bytes directly and skip the decode
+            return result.returncode == 0, output.decode('utf-8', 'replace') if decode else output
         except subprocess.CalledProcessError as e:
-            return False, str(e)
+            error = str(e)
+        except FileNotFoundError:
+            error = "hcloud CLI not found"
+        return False, error if decode else error.encode()
+    
+    def run_hcloud_quiet(self, cmd: List[str]) -> bool:
+        """Run an hcloud probe whose output is not needed; only the exit status is returned"""
+        try:
+            result = subprocess.run(
+                ['hcloud', *cmd],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=self._hcloud_env()
+            )
         except FileNotFoundError:
-            return False, "hcloud CLI not found"
+            return False
+        return result.returncode == 0
     
     def check_dependencies(self) -> bool:
         """Check if hcloud CLI is available"""
-        success, _ = self.run_hcloud_command(['version'])
+        success = self.run_hcloud_quiet(['version'])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} hcloud CLI is available")
+            print(f"{_OK} hcloud CLI is available")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} hcloud CLI not found. Please install it first.")
+            print(f"{_ERR} hcloud CLI not found. Please install it first.")
+            return False
+    
+    def has_token(self) -> bool:
+        """Check that an API token is configured, without calling hcloud"""
+        if not self.config.get('HETZNER_TOKEN'):
+            print(f"{_ERR} Hetzner Cloud API token is required")
+            print("Set HETZNER_TOKEN in .env file")
             return False
+        return True
     
     def validate_token(self) -> bool:
         """Validate Hetzner Cloud API token"""
-        if 'HETZNER_TOKEN' not in self.config or not self.config['HETZNER_TOKEN']:
-            print(f"{Colors.RED}✗{Colors.NC} Hetzner Cloud API token is required")
-            print("Set HETZNER_TOKEN in .env file")
+        if not self.has_token():
             return False
         
-        success, _ = self.run_hcloud_command(['context', 'list'])
+        success = self.run_hcloud_quiet(['context', 'list'])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} API token is valid")
+            print(f"{_OK} API token is valid")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Invalid Hetzner Cloud API token")
+            print(f"{_ERR} Invalid Hetzner Cloud API token")
             return False
 
+    def doctor(self) -> bool:
+        """Check the hcloud CLI and API token"""
+        # Neither check depends on the other, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            dependencies_ok = pool.submit(self.check_dependencies)
+            token_ok = pool.submit(self.validate_token)
+            return dependencies_ok.result() and token_ok.result()
+
     # Server Management Functions
     def list_servers(self) -> bool:
         """List all servers"""
@@ -94,7 +163,7 @@ class HetznerManager:
             print(output)
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to list servers: {output}")
+            print(f"{_ERR} Failed to list servers: {output}")
             return False
     
     def server_info(self, server_name: str) -> bool:
@@ -105,52 +174,75 @@ class HetznerManager:
             print(output)
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to get server info: {output}")
+            print(f"{_ERR} Failed to get server info: {output}")
             return False
     
     def start_server(self, server_name: str) -> bool:
         """Start a server"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Starting server: {server_name}")
+        print(f"{_ARROW} Starting server: {server_name}")
         success, output = self.run_hcloud_command(['server', 'poweron', server_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Server started successfully: {server_name}")
+            self._server_cache = None
+            print(f"{_OK} Server started successfully: {server_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to start server: {output}")
+            print(f"{_ERR} Failed to start server: {output}")
             return False
     
     def stop_server(self, server_name: str) -> bool:
         """Stop a server"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Stopping server: {server_name}")
+        print(f"{_ARROW} Stopping server: {server_name}")
         success, output = self.run_hcloud_command(['server', 'poweroff', server_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Server stopped successfully: {server_name}")
+            self._server_cache = None
+            print(f"{_OK} Server stopped successfully: {server_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to stop server: {output}")
+            print(f"{_ERR} Failed to stop server: {output}")
             return False
     
     def restart_server(self, server_name: str) -> bool:
         """Restart a server"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Restarting server: {server_name}")
+        print(f"{_ARROW} Restarting server: {server_name}")
         success, output = self.run_hcloud_command(['server', 'reboot', server_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Server restarted successfully: {server_name}")
+            self._server_cache = None
+            print(f"{_OK} Server restarted successfully: {server_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to restart server: {output}")
+            print(f"{_ERR} Failed to restart server: {output}")
             return False
     
-    def delete_server(self, server_name: str, confirm: bool = False) -> bool:
+    @staticmethod
+    def _server_summary(record: Dict) -> Optional[str]:
+        """Details of a `server list` record for the delete prompt, None if a field is missing"""
+        try:
+            return "\n".join((
+                f"Name:     {record['name']} (ID {record['id']})",
+                f"Status:   {record['status']}",
+                f"Type:     {record['server_type']['name']}",
+                f"Image:    {record['image']['name']}",
+                f"Location: {record['datacenter']['location']['name']}",
+                f"IPv4:     {record['public_net']['ipv4']['ip']}"
+            ))
+        except (KeyError, TypeError):
+            return None
+    
+    def delete_server(self, server_name: str, confirm: bool = False, prefetched: Optional[Dict] = None) -> bool:
         """Delete a server"""
         if not confirm:
-            # Show server details before deletion
+            # Show server details before deletion, from a known record when there is one
             print(f"{Colors.BLUE}Server to be deleted:{Colors.NC}")
-            success, output = self.run_hcloud_command(['server', 'describe', server_name])
-            if success:
-                print(output)
+            prefetched = prefetched or self._cached_server(server_name)
+            summary = self._server_summary(prefetched) if prefetched else None
+            if summary:
+                print(summary)
             else:
-                print(f"{Colors.RED}Warning: Could not retrieve server details{Colors.NC}")
+                success, output = self.run_hcloud_command(['server', 'describe', server_name])
+                if success:
+                    print(output)
+                else:
+                    print(f"{Colors.RED}Warning: Could not retrieve server details{Colors.NC}")
             
             print(f"\n{Colors.RED}⚠️  WARNING: This action cannot be undone!{Colors.NC}")
             response = input(f"Type 'YES' to confirm deletion of server '{server_name}': ")
@@ -158,19 +250,67 @@ class HetznerManager:
                 print("Operation cancelled (must type exactly 'YES' to confirm)")
                 return False
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Deleting server: {server_name}")
+        print(f"{_ARROW} Deleting server: {server_name}")
         success, output = self.run_hcloud_command(['server', 'delete', server_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Server deleted successfully: {server_name}")
+            self._server_cache = None
+            print(f"{_OK} Server deleted successfully: {server_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to delete server: {output}")
+            print(f"{_ERR} Failed to delete server: {output}")
             return False
     
+    def _max_concurrency(self) -> int:
+        """MAX_CONCURRENCY from the config, at least 1; falls back to 5 if it is not a number"""
+        value = self.config.get('MAX_CONCURRENCY', '5')
+        try:
+            return max(int(value), 1)
+        except ValueError:
+            print(f"{_WARN} Invalid MAX_CONCURRENCY '{value}', using 5")
+            return 5
+    
+    def bulk_action(self, server_names: List[str], action: str, confirm: bool = False) -> bool:
+        """Start, stop, restart or delete several servers concurrently"""
+        server_names = list(dict.fromkeys(server_names))
+        
+        if action == 'delete' and len(server_names) > 1 and not confirm:
+            print(f"{Colors.BLUE}Servers to be deleted:{Colors.NC}")
+            for name in server_names:
+                print(f"  • {name}")
+            print(f"\n{Colors.RED}⚠️  WARNING: This action cannot be undone!{Colors.NC}")
+            response = input(f"Type 'YES' to confirm deletion of {len(server_names)} servers: ")
+            if response != 'YES':
+                print("Operation cancelled (must type exactly 'YES' to confirm)")
+                return False
+            confirm = True
+        
+        handler = {
+            'start': self.start_server,
+            'stop': self.stop_server,
+            'restart': self.restart_server,
+            'delete': lambda name: self.delete_server(name, confirm)
+        }[action]
+        
+        if len(server_names) == 1:
+            return handler(server_names[0])
+        
+        # Each call waits on its own hcloud process, so the actions overlap instead of queueing
+        with ThreadPoolExecutor(max_workers=min(self._max_concurrency(), len(server_names))) as pool:
+            succeeded = sum(pool.map(handler, server_names))
+        
+        if succeeded == len(server_names):
+            print(f"{_OK} {action.capitalize()} succeeded for all {succeeded} servers")
+            return True
+        print(f"{_ERR} {action.capitalize()} succeeded for {succeeded}/{len(server_names)} servers")
+        return False
+    
     def interactive_delete(self) -> bool:
         """Interactive server deletion with server selection"""
+        records = self._servers()
+        if records is None:
+            return False
         print(f"{Colors.BLUE}Available servers for deletion:{Colors.NC}")
-        servers = self.get_servers()
+        servers = [server['name'] for server in records]
         if not servers:
             print(f"{Colors.YELLOW}No servers found{Colors.NC}")
             return True
@@ -180,55 +320,107 @@ class HetznerManager:
             print(f"  {i}. {server}")
         
         try:
-            choice = input(f"\nSelect server to delete (1-{len(servers)}) or 0 to cancel: ")
-            if choice == '0':
-                print("Operation cancelled")
-                return True
-            
-            server_index = int(choice) - 1
-            if 0 <= server_index < len(servers):
-                selected_server = servers[server_index]
-                return self.delete_server(selected_server, confirm=False)
-            else:
-                print(f"{Colors.RED}Invalid selection{Colors.NC}")
-                return False
-        except (ValueError, KeyboardInterrupt):
+            choice = input(f"\nSelect servers to delete (1-{len(servers)}, e.g. 1,3,5-7) or 0 to cancel: ")
+        except KeyboardInterrupt:
             print("\nOperation cancelled")
             return False
+        if choice.strip() == '0':
+            print("Operation cancelled")
+            return True
+        
+        try:
+            indices = self.parse_selection(choice, len(servers))
+        except ValueError:
+            print(f"{Colors.RED}Invalid selection{Colors.NC}")
+            return False
+        
+        if len(indices) == 1:
+            return self.delete_server(servers[indices[0]], confirm=False, prefetched=records[indices[0]])
+        # One confirmation for the whole batch, then the deletes run in parallel
+        return self.bulk_action([servers[i] for i in indices], 'delete')
+    
+    @staticmethod
+    def parse_selection(selection: str, count: int) -> List[int]:
+        """Zero-based indices for a 1-based selection such as '1,3,5-7'"""
+        indices: List[int] = []
+        for part in selection.replace(' ', '').split(','):
+            first, dash, last = part.partition('-')
+            start = int(first)
+            end = int(last) if dash else start
+            if not 1 <= start <= end <= count:
+                raise ValueError(f"Selection out of range: {part}")
+            indices.extend(range(start - 1, end))
+        return list(dict.fromkeys(indices))
+    
+    def _cached_servers(self) -> Optional[List[Dict]]:
+        """The server list from the cache if it is younger than SERVER_LIST_TTL, without calling the API"""
+        if self._server_cache and time.monotonic() - self._server_cache[0] < self.SERVER_LIST_TTL:
+            return self._server_cache[1]
+        return None
+    
+    def _cached_server(self, server_name: str) -> Optional[Dict]:
+        """Record for a server name or ID from a fresh server list cache, None if it is not cached"""
+        for record in self._cached_servers() or []:
+            if server_name in (record.get('name'), str(record.get('id'))):
+                return record
+        return None
+    
+    def _servers(self) -> Optional[List[Dict]]:
+        """Parsed `hcloud server list -o json`, cached for SERVER_LIST_TTL seconds; None if it fails"""
+        cached = self._cached_servers()
+        if cached is not None:
+            return cached
+        
+        success, output = self.run_hcloud_command(['server', 'list', '-o', 'json'], decode=False)
+        if not success:
+            # Keep hcloud's own message, e.g. a missing CLI or an invalid token
+            print(f"{_ERR} Failed to list servers: {output.decode('utf-8', 'replace')}")
+            return None
+        try:
+            data = _json.loads(output)
+        except json.JSONDecodeError as e:
+            print(f"{_ERR} Could not parse server list: {e}")
+            return None
+        self._server_cache = (time.monotonic(), data)
+        return data
     
     def get_servers(self) -> List[str]:
         """Get list of server names"""
-        success, output = self.run_hcloud_command(['server', 'list', '-o', 'json'])
-        if success:
-            try:
-                data = json.loads(output)
-                return [server['name'] for server in data]
-            except json.JSONDecodeError:
-                return []
-        return []
+        return [server['name'] for server in self._servers() or []]
     
     def ssh_server(self, server_name: str) -> bool:
         """SSH into a server"""
         print(f"{Colors.BLUE}Getting IP for server: {server_name}{Colors.NC}")
-        success, output = self.run_hcloud_command(['server', 'ip', server_name])
+        # A freshly listed record already has the IP; otherwise ask hcloud for it
+        record = self._cached_server(server_name) or {}
+        try:
+            success, output = True, record['public_net']['ipv4']['ip']
+        except (KeyError, TypeError):
+            success, output = self.run_hcloud_command(['server', 'ip', server_name])
         if success:
             ip = output.strip()
-            print(f"{Colors.YELLOW}→{Colors.NC} Connecting to {server_name} ({ip})")
-            os.system(f"ssh root@{ip}")
-            return True
+            print(f"{_ARROW} Connecting to {server_name} ({ip})")
+            sys.stdout.flush()
+            try:
+                # Replace this process with ssh; no intermediate shell and the IP is never shell-parsed
+                os.execvp('ssh', ['ssh', f'root@{ip}'])
+            except OSError as e:
+                print(f"{_ERR} Failed to start ssh: {e}")
+                return False
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to get server IP: {output}")
+            print(f"{_ERR} Failed to get server IP: {output}")
             return False
     
     def resize_server(self, server_name: str, server_type: str) -> bool:
         """Resize server to new type"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Resizing server {server_name} to {server_type}")
+        print(f"{_ARROW} Resizing server {server_name} to {server_type}")
         success, output = self.run_hcloud_command(['server', 'change-type', server_name, server_type])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Server resized successfully: {server_name}")
+            self._server_cache = None
+            print(f"{_OK} Server resized successfully: {server_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to resize server: {output}")
+            print(f"{_ERR} Failed to resize server: {output}")
             return False
 
     # SSH Key Management Functions
@@ -240,22 +432,22 @@ class HetznerManager:
             print(output)
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to list SSH keys: {output}")
+            print(f"{_ERR} Failed to list SSH keys: {output}")
             return False
     
     def add_ssh_key(self, key_name: str, key_file: str) -> bool:
         """Add SSH key from file"""
         if not os.path.exists(key_file):
-            print(f"{Colors.RED}✗{Colors.NC} SSH key file not found: {key_file}")
+            print(f"{_ERR} SSH key file not found: {key_file}")
             return False
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Adding SSH key: {key_name}")
+        print(f"{_ARROW} Adding SSH key: {key_name}")
         success, output = self.run_hcloud_command(['ssh-key', 'create', '--name', key_name, '--public-key-from-file', key_file])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} SSH key added successfully: {key_name}")
+            print(f"{_OK} SSH key added successfully: {key_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to add SSH key: {output}")
+            print(f"{_ERR} Failed to add SSH key: {output}")
             return False
     
     def delete_ssh_key(self, key_name: str, confirm: bool = False) -> bool:
@@ -266,13 +458,13 @@ class HetznerManager:
                 print("Operation cancelled")
                 return False
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Deleting SSH key: {key_name}")
+        print(f"{_ARROW} Deleting SSH key: {key_name}")
         success, output = self.run_hcloud_command(['ssh-key', 'delete', key_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} SSH key deleted successfully: {key_name}")
+            print(f"{_OK} SSH key deleted successfully: {key_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to delete SSH key: {output}")
+            print(f"{_ERR} Failed to delete SSH key: {output}")
             return False
 
     # Volume Management Functions
@@ -284,12 +476,12 @@ class HetznerManager:
             print(output)
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to list volumes: {output}")
+            print(f"{_ERR} Failed to list volumes: {output}")
             return False
     
     def create_volume(self, volume_name: str, size: int, location: str = 'nbg1') -> bool:
         """Create a volume"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Creating volume: {volume_name} ({size}GB)")
+        print(f"{_ARROW} Creating volume: {volume_name} ({size}GB)")
         success, output = self.run_hcloud_command([
             'volume', 'create',
             '--name', volume_name,
@@ -298,32 +490,32 @@ class HetznerManager:
             '--format', 'ext4'
         ])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Volume created successfully: {volume_name}")
+            print(f"{_OK} Volume created successfully: {volume_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to create volume: {output}")
+            print(f"{_ERR} Failed to create volume: {output}")
             return False
     
     def attach_volume(self, server_name: str, volume_name: str) -> bool:
         """Attach volume to server"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Attaching volume {volume_name} to server {server_name}")
+        print(f"{_ARROW} Attaching volume {volume_name} to server {server_name}")
         success, output = self.run_hcloud_command(['volume', 'attach', volume_name, server_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Volume attached successfully")
+            print(f"{_OK} Volume attached successfully")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to attach volume: {output}")
+            print(f"{_ERR} Failed to attach volume: {output}")
             return False
     
     def detach_volume(self, volume_name: str) -> bool:
         """Detach volume from server"""
-        print(f"{Colors.YELLOW}→{Colors.NC} Detaching volume: {volume_name}")
+        print(f"{_ARROW} Detaching volume: {volume_name}")
         success, output = self.run_hcloud_command(['volume', 'detach', volume_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Volume detached successfully: {volume_name}")
+            print(f"{_OK} Volume detached successfully: {volume_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to detach volume: {output}")
+            print(f"{_ERR} Failed to detach volume: {output}")
             return False
     
     def delete_volume(self, volume_name: str, confirm: bool = False) -> bool:
@@ -334,15 +526,36 @@ class HetznerManager:
                 print("Operation cancelled")
                 return False
         
-        print(f"{Colors.YELLOW}→{Colors.NC} Deleting volume: {volume_name}")
+        print(f"{_ARROW} Deleting volume: {volume_name}")
         success, output = self.run_hcloud_command(['volume', 'delete', volume_name])
         if success:
-            print(f"{Colors.GREEN}✓{Colors.NC} Volume deleted successfully: {volume_name}")
+            print(f"{_OK} Volume deleted successfully: {volume_name}")
             return True
         else:
-            print(f"{Colors.RED}✗{Colors.NC} Failed to delete volume: {output}")
+            print(f"{_ERR} Failed to delete volume: {output}")
             return False
 
+# Subcommand name -> handler, called with the manager and the parsed arguments
+COMMANDS: Dict[str, Callable[[HetznerManager, argparse.Namespace], bool]] = {
+    'doctor': lambda m, a: m.doctor(),
+    'list': lambda m, a: m.list_servers(),
+    'info': lambda m, a: m.server_info(a.server_name),
+    'start': lambda m, a: m.bulk_action(a.server_name, 'start'),
+    'stop': lambda m, a: m.bulk_action(a.server_name, 'stop'),
+    'restart': lambda m, a: m.bulk_action(a.server_name, 'restart'),
+    'delete': lambda m, a: m.bulk_action(a.server_name, 'delete', a.yes) if a.server_name else m.interactive_delete(),
+    'ssh': lambda m, a: m.ssh_server(a.server_name),
+    'resize': lambda m, a: m.resize_server(a.server_name, a.server_type),
+    'list-keys': lambda m, a: m.list_ssh_keys(),
+    'add-key': lambda m, a: m.add_ssh_key(a.key_name, a.key_file),
+    'delete-key': lambda m, a: m.delete_ssh_key(a.key_name, a.yes),
+    'list-volumes': lambda m, a: m.list_volumes(),
+    'create-volume': lambda m, a: m.create_volume(a.volume_name, a.size, a.location),
+    'attach-volume': lambda m, a: m.attach_volume(a.server_name, a.volume_name),
+    'detach-volume': lambda m, a: m.detach_volume(a.volume_name),
+    'delete-volume': lambda m, a: m.delete_volume(a.volume_name, a.yes),
+}
+
 def main():
     """Main function to handle command-line arguments"""
     parser = argparse.ArgumentParser(
@@ -354,6 +567,7 @@ Examples:
   python3 manage.py info my-server         # Show server details
   python3 manage.py start my-server        # Start a server
   python3 manage.py stop my-server         # Stop a server
+  python3 manage.py restart web-001 web-002 # Restart several servers in parallel
   python3 manage.py delete my-server       # Delete a server
   python3 manage.py ssh my-server          # SSH into server
   python3 manage.py resize my-server cpx21 # Resize server
@@ -367,6 +581,8 @@ Examples:
   python3 manage.py attach-volume my-server myvolume
   python3 manage.py detach-volume myvolume
   python3 manage.py delete-volume myvolume
+  
+  python3 manage.py doctor                 # Check hcloud CLI and API token
         """
     )
     
@@ -379,17 +595,17 @@ Examples:
     info_parser = subparsers.add_parser('info', help='Show server information')
     info_parser.add_argument('server_name', help='Server name')
     
-    start_parser = subparsers.add_parser('start', help='Start a server')
-    start_parser.add_argument('server_name', help='Server name')
+    start_parser = subparsers.add_parser('start', help='Start one or more servers')
+    start_parser.add_argument('server_name', nargs='+', help='Server name(s)')
     
-    stop_parser = subparsers.add_parser('stop', help='Stop a server')
-    stop_parser.add_argument('server_name', help='Server name')
+    stop_parser = subparsers.add_parser('stop', help='Stop one or more servers')
+    stop_parser.add_argument('server_name', nargs='+', help='Server name(s)')
     
-    restart_parser = subparsers.add_parser('restart', help='Restart a server')
-    restart_parser.add_argument('server_name', help='Server name')
+    restart_parser = subparsers.add_parser('restart', help='Restart one or more servers')
+    restart_parser.add_argument('server_name', nargs='+', help='Server name(s)')
     
-    delete_parser = subparsers.add_parser('delete', help='Delete a server')
-    delete_parser.add_argument('server_name', nargs='?', help='Server name (optional - will list servers if not provided)')
+    delete_parser = subparsers.add_parser('delete', help='Delete one or more servers')
+    delete_parser.add_argument('server_name', nargs='*', help='Server name(s) (optional - will list servers if not provided)')
     delete_parser.add_argument('--yes', action='store_true', help='Skip confirmation')
     
     ssh_parser = subparsers.add_parser('ssh', help='SSH into a server')
@@ -429,6 +645,9 @@ Examples:
     delete_vol_parser.add_argument('volume_name', help='Volume name')
     delete_vol_parser.add_argument('--yes', action='store_true', help='Skip confirmation')
     
+    # Diagnostics
+    subparsers.add_parser('doctor', help='Check hcloud CLI and API token')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -438,54 +657,18 @@ Examples:
     # Initialize manager
     manager = HetznerManager()
     
-    # Check dependencies
-    if not manager.check_dependencies():
-        return 1
-    
-    # Validate token
-    if not manager.validate_token():
+    # Commands go straight to hcloud, which reports a missing CLI or bad token itself;
+    # only the local token check runs up front
+    if args.command != 'doctor' and not manager.has_token():
         return 1
     
     # Execute commands
     try:
-        if args.command == 'list':
-            success = manager.list_servers()
-        elif args.command == 'info':
-            success = manager.server_info(args.server_name)
-        elif args.command == 'start':
-            success = manager.start_server(args.server_name)
-        elif args.command == 'stop':
-            success = manager.stop_server(args.server_name)
-        elif args.command == 'restart':
-            success = manager.restart_server(args.server_name)
-        elif args.command == 'delete':
-            if args.server_name:
-                success = manager.delete_server(args.server_name, args.yes)
-            else:
-                success = manager.interactive_delete()
-        elif args.command == 'ssh':
-            success = manager.ssh_server(args.server_name)
-        elif args.command == 'resize':
-            success = manager.resize_server(args.server_name, args.server_type)
-        elif args.command == 'list-keys':
-            success = manager.list_ssh_keys()
-        elif args.command == 'add-key':
-            success = manager.add_ssh_key(args.key_name, args.key_file)
-        elif args.command == 'delete-key':
-            success = manager.delete_ssh_key(args.key_name, args.yes)
-        elif args.command == 'list-volumes':
-            success = manager.list_volumes()
-        elif args.command == 'create-volume':
-            success = manager.create_volume(args.volume_name, args.size, args.location)
-        elif args.command == 'attach-volume':
-            success = manager.attach_volume(args.server_name, args.volume_name)
-        elif args.command == 'detach-volume':
-            success = manager.detach_volume(args.volume_name)
-        elif args.command == 'delete-volume':
-            success = manager.delete_volume(args.volume_name, args.yes)
-        else:
-            print(f"{Colors.RED}✗{Colors.NC} Unknown command: {args.command}")
+        handler = COMMANDS.get(args.command)
+        if handler is None:
+            print(f"{_ERR} Unknown command: {args.command}")
             return 1
+        success = handler(manager, args)
         
         return 0 if success else 1
         
@@ -493,7 +676,7 @@ Examples:
         print(f"\n{Colors.YELLOW}Operation cancelled by user{Colors.NC}")
         return 1
     except Exception as e:
-        print(f"{Colors.RED}✗{Colors.NC} Unexpected error: {e}")
+        print(f"{_ERR} Unexpected error: {e}")
         return 1
 
 if __name__ == '__main__':
@@ -8,23 +8,21 @@ import subprocess
 import sys
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
+SEPARATOR = '=' * 60
 
-def run_test_file(test_file, description):
-    """Run a specific test file and return success status"""
-    print(f"\n{'='*60}")
-    print(f"Running {description}")
-    print(f"{'='*60}")
-    
+
+def run_test_file(test_file):
+    """Run a specific test file and return its success status and combined output"""
     try:
         result = subprocess.run([
-            sys.executable, f"tests/{test_file}"
-        ], cwd=os.getcwd(), capture_output=False)
+            sys.executable, "-m", "pytest", f"tests/{test_file}"
+        ], cwd=os.getcwd(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
         
-        return result.returncode == 0
+        return result.returncode == 0, result.stdout
     except Exception as e:
-        print(f"Error running {test_file}: {e}")
-        return False
+        return False, f"Error running {test_file}: {e}\n"
 
 
 def main():
@@ -53,35 +51,40 @@ Examples:
         args.deploy = True
         args.manage = True
     
-    success_count = 0
-    total_count = 0
-    
-    # Run deploy tests
+    suites = []
     if args.deploy:
-        total_count += 1
-        if run_test_file("test_deploy.py", "Deploy Tool Tests (test_deploy.py)"):
-            success_count += 1
-    
-    # Run manage tests  
+        suites.append(("test_deploy.py", "Deploy Tool Tests (test_deploy.py)"))
     if args.manage:
-        total_count += 1
-        if run_test_file("test_manage.py", "Management Tool Tests (test_manage.py)"):
-            success_count += 1
+        suites.append(("test_manage.py", "Management Tool Tests (test_manage.py)"))
     
-    # Print overall summary
-    print(f"\n{'='*60}")
-    print("OVERALL TEST SUMMARY")
-    print(f"{'='*60}")
-    print(f"Test suites run: {total_count}")
-    print(f"Test suites passed: {success_count}")
-    print(f"Test suites failed: {total_count - success_count}")
+    # Run the suites side by side; output is captured so it can be printed per suite
+    with ThreadPoolExecutor(max_workers=len(suites)) as pool:
+        results = list(pool.map(run_test_file, [test_file for test_file, _ in suites]))
+    
+    total_count = len(suites)
+    success_count = sum(success for success, _ in results)
+    
+    # Build the per-suite output and the overall summary, then write it in one go
+    lines = []
+    for (_, description), (_, output) in zip(suites, results):
+        lines += [f"\n{SEPARATOR}", f"Running {description}", SEPARATOR, output.rstrip('\n')]
+    
+    lines += [
+        f"\n{SEPARATOR}",
+        "OVERALL TEST SUMMARY",
+        SEPARATOR,
+        f"Test suites run: {total_count}",
+        f"Test suites passed: {success_count}",
+        f"Test suites failed: {total_count - success_count}"
+    ]
     
     if success_count == total_count:
-        print(f"\n🎉 All test suites passed successfully!")
-        return 0
+        lines.append(f"\n🎉 All test suites passed successfully!")
     else:
-        print(f"\n❌ {total_count - success_count} test suite(s) failed")
-        return 1
+        lines.append(f"\n❌ {total_count - success_count} test suite(s) failed")
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    return 0 if success_count == total_count else 1
 
 
 if __name__ == "__main__":
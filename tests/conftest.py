@@ -0,0 +1,19 @@
+"""Shared pytest fixtures for the deploy.py and manage.py test suites"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Make deploy.py and manage.py importable from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deploy
+
+
+@pytest.fixture(scope='session')
+def deployer():
+    """One HetznerDeployer for the whole session (per xdist worker), built with a test token"""
+    with patch('deploy._load_env_file', return_value={'HETZNER_TOKEN': 'test_token_123'}):
+        return deploy.HetznerDeployer()
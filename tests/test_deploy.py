@@ -2,8 +2,10 @@
 """
 Comprehensive test suite for deploy.py
 
-This test suite uses the actual .env file and only tests methods that exist,
-with proper data structures based on the actual Hetzner Cloud API.
+The class-level deployer reads the project .env once (HETZNER_TOKEN from the
+environment, or a test token, when there is none); every other deployer is built
+with _load_env_file patched. hcloud is never actually run: the tests feed it data
+structures based on the actual Hetzner Cloud API.
 """
 
 import unittest
@@ -11,286 +13,391 @@ from unittest.mock import Mock, patch, mock_open
 import json
 import os
 import sys
+import threading
+from operator import attrgetter
+from types import SimpleNamespace
+
+import pytest
 
 # Add parent directory to path to import deploy.py
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
+import deploy
+
+# Canned subprocess.run results; plain namespaces are all run_hcloud_command reads
+_RUN_OK = SimpleNamespace(returncode=0, stdout=b'{"servers": []}\n', stderr=b'')
+# The code returns stdout even on failure
+_RUN_FAIL = SimpleNamespace(returncode=1, stdout=b'Error: invalid token', stderr=b'')
+
+_subprocess_patcher = patch('subprocess.run')
+
+
+def setUpModule():
+    """Patch subprocess.run once for the whole module so no test can reach the real hcloud"""
+    global _subprocess_run
+    _subprocess_run = _subprocess_patcher.start()
+
+
+def tearDownModule():
+    """Restore subprocess.run"""
+    _subprocess_patcher.stop()
+
 
 class TestDeployFunctionsWithRealEnv(unittest.TestCase):
     """Test deploy.py functions using actual .env configuration"""
     
-    def setUp(self):
-        """Set up test environment with real .env file"""
-        # Load actual .env file from parent directory
-        env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-        if os.path.exists(env_file):
-            with open(env_file, 'r') as f:
-                env_content = f.read()
+    @classmethod
+    def setUpClass(cls):
+        """Build one deployer from the real configuration, read once for the whole class"""
+        if 'HETZNER_TOKEN' in os.environ:
+            # CI supplies the token directly, so there is no .env to look for
+            cls._env_config = {'HETZNER_TOKEN': os.environ['HETZNER_TOKEN']}
         else:
-            env_content = 'HETZNER_TOKEN=test_token_123'
+            env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
+            cls._env_config = deploy._load_env_file(env_file) or {'HETZNER_TOKEN': 'test_token_123'}
         
-        # Mock file operations to use real .env content
-        self.file_patcher = patch('builtins.open', mock_open(read_data=env_content))
-        self.file_patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.file_patcher.stop()
+        with patch('deploy._load_env_file', return_value=cls._env_config):
+            cls.deployer = deploy.HetznerDeployer()
+        
+        # Serialized API responses shared by the tests; the API reports prices per 'location'
+        cls.SERVER_TYPES_JSON = json.dumps([
+            {
+                'name': 'cpx11',
+                'prices': [
+                    {'location': 'nbg1', 'price_hourly': {'net': '0.0063'}},
+                    {'location': 'fsn1', 'price_hourly': {'net': '0.0063'}}
+                ]
+            },
+            {
+                'name': 'cpx21', 
+                'prices': [
+                    {'location': 'nbg1', 'price_hourly': {'net': '0.0126'}},
+                    {'location': 'ash', 'price_hourly': {'net': '0.0126'}}
+                ]
+            },
+            {
+                'name': 'cpx31',
+                'prices': [
+                    {'location': 'ash', 'price_hourly': {'net': '0.0252'}}
+                ]
+            }
+        ])
+        cls.IMAGES_JSON = json.dumps([
+            {'name': 'ubuntu-22.04', 'type': 'system'},
+            {'name': 'ubuntu-20.04', 'type': 'system'},
+            {'name': 'debian-11', 'type': 'system'},
+            {'name': 'my-snapshot', 'type': 'snapshot'},  # Should be filtered out
+            {'name': 'centos-stream-9', 'type': 'system'},
+            {'name': 'windows-server-2019', 'type': 'system'}  # Should be filtered out
+        ])
+        cls.SSH_KEYS_JSON = json.dumps([
+            {'name': 'my-key-1'},
+            {'name': 'my-key-2'},
+            {'name': 'backup-key'}
+        ])
+    
+    def setUp(self):
+        """Stub out hcloud calls and start from an empty metadata cache"""
+        patcher = patch.object(deploy.HetznerDeployer, 'run_hcloud_command')
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+        # Cached API responses must not leak from one test into the next
+        self.deployer._meta_cache.clear()
 
     def test_import_and_create_deployer(self):
         """Test importing deploy module and creating HetznerDeployer"""
         try:
-            import deploy
-            
             # Test that we can create a deployer instance
-            deployer = deploy.HetznerDeployer()
-            self.assertIsInstance(deployer, deploy.HetznerDeployer)
+            with patch('deploy._load_env_file', return_value=self._env_config):
+                deployer = deploy.HetznerDeployer()
+            assert isinstance(deployer, deploy.HetznerDeployer)
             
-            # Test that Colors class exists
-            colors = deploy.Colors()
-            self.assertTrue(hasattr(colors, 'RED'))
-            self.assertTrue(hasattr(colors, 'GREEN'))
+            # Test that Colors class exists; a missing code raises AttributeError
+            attrgetter('RED', 'GREEN', 'NC')(deploy.Colors())
             
         except Exception as e:
-            self.fail(f"Failed to import and create deployer: {e}")
+            pytest.fail(f"Failed to import and create deployer: {e}")
 
-    @patch('subprocess.run')
-    def test_run_hcloud_command_success(self, mock_run):
-        """Test successful hcloud command execution"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock successful command
-        mock_run.return_value = Mock(
-            returncode=0, 
-            stdout='{"servers": []}', 
-            stderr=''
-        )
-        
-        success, output = deployer.run_hcloud_command(['server', 'list', '-o', 'json'])
-        
-        self.assertTrue(success)
-        self.assertEqual(output, '{"servers": []}')
+    def test_load_env_config(self):
+        """Test .env parsing skips comments, blanks and malformed lines"""
+        from tempfile import TemporaryDirectory
 
-    @patch('subprocess.run')
-    def test_run_hcloud_command_failure(self, mock_run):
-        """Test failed hcloud command execution"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock failed command - the code returns stdout even on failure
-        mock_run.return_value = Mock(
-            returncode=1, 
-            stdout='Error: invalid token', 
-            stderr=''
-        )
-        
-        success, output = deployer.run_hcloud_command(['server', 'list'])
-        
-        self.assertFalse(success)
-        self.assertEqual(output, 'Error: invalid token')
+        with TemporaryDirectory() as tmp:
+            env_file = os.path.join(tmp, '.env')
+            with open(env_file, 'w') as f:
+                f.write("# comment\n\nHETZNER_TOKEN=abc=123\n  DEFAULT_LOCATION=ash  \nnot a setting\n"
+                        "DEFAULT_IMAGE = ubuntu-24.04\n  # DEFAULT_NETWORK=ignored\nbad-name=x\n")
+
+            assert deploy._load_env_file(env_file) == {
+                'HETZNER_TOKEN': 'abc=123', 'DEFAULT_LOCATION': 'ash', 'DEFAULT_IMAGE': 'ubuntu-24.04'
+            }
+            # A missing file is not an error, it just contributes no settings
+            assert deploy._load_env_file(os.path.join(tmp, 'missing.env')) is None
+
+    @patch('deploy.time.sleep')
+    @patch('deploy.time.monotonic', return_value=100.0)
+    def test_token_bucket_paces_after_burst(self, mock_monotonic, mock_sleep):
+        """Test that the token bucket only sleeps once the burst is used up"""
+        bucket = deploy.TokenBucket(rate=2.0, burst=2)
+
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        # Without time passing, each extra call waits one more refill interval
+        bucket.acquire()
+        bucket.acquire()
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1.0]
+
+    def test_only_api_calls_take_rate_tokens(self):
+        """Test that reads and mutations are paced but local hcloud commands are not"""
+        self.mock_run.return_value = (True, '')
+        with patch.object(self.deployer, '_bucket') as mock_bucket:
+            self.deployer._read(['server', 'list', '-o', 'json'])
+            self.deployer._mutate(['server', 'delete', 'web'])
+            self.deployer.check_dependencies()
+            self.deployer.validate_token()
+
+        assert mock_bucket.acquire.call_count == 2
+
+    def test_mutations_bounded_by_max_concurrency(self):
+        """Test that mutating calls never exceed MAX_CONCURRENCY in flight"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        with patch('deploy._load_env_file', return_value={'HETZNER_TOKEN': 'abc', 'MAX_CONCURRENCY': '2'}):
+            deployer = deploy.HetznerDeployer()
+
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def fake_run(cmd, decode=True):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+            return True, ''
+
+        with patch.object(deployer, 'run_hcloud_command', side_effect=fake_run):
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                list(pool.map(lambda i: deployer._mutate(['volume', 'create', str(i)]), range(6)))
+
+        assert state['peak'] == 2
+
+    def test_invalid_max_concurrency_falls_back(self):
+        """Test that an empty, non-numeric or too small MAX_CONCURRENCY never breaks startup"""
+        for value, expected in (('', 5), ('many', 5), ('0', 1), ('-3', 1), ('8', 8)):
+            with self.subTest(value=value):
+                with patch('deploy._load_env_file', return_value={'HETZNER_TOKEN': 'abc', 'MAX_CONCURRENCY': value}), \
+                        patch('sys.stdout'):
+                    deployer = deploy.HetznerDeployer()
+                assert deployer.max_concurrency == expected
+
+    def test_server_ips(self):
+        """Test IP extraction from server details, including missing networks"""
+        server = {
+            'public_net': {'ipv4': {'ip': '192.0.2.10'}},
+            'private_net': [{'ip': '10.0.0.2'}]
+        }
+        assert deploy.HetznerDeployer._server_ips(server) == ('192.0.2.10', '10.0.0.2')
+
+        # IPv4 disabled and no private network attached
+        server = {'public_net': {'ipv4': None}, 'private_net': []}
+        assert deploy.HetznerDeployer._server_ips(server) == ('N/A', 'N/A')
+
+    def test_derive_names(self):
+        """Test server name generation for single servers and fleets"""
+        assert deploy.HetznerDeployer._derive_names('web', 1) == ['web']
+        assert deploy.HetznerDeployer._derive_names('web', 3) == ['web-001', 'web-002', 'web-003']
 
     def test_convert_tags(self):
         """Test tag conversion functionality"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
         # Test colon to equals conversion
-        result = deployer.convert_tags("env:prod,team:backend,version:1.0")
+        result = self.deployer.convert_tags("env:prod,team:backend,version:1.0")
         expected = "env=prod,team=backend,version=1.0"
-        self.assertEqual(result, expected)
+        assert result == expected
         
         # Test already correct format
-        result = deployer.convert_tags("env=prod,team=backend")
+        result = self.deployer.convert_tags("env=prod,team=backend")
         expected = "env=prod,team=backend"
-        self.assertEqual(result, expected)
+        assert result == expected
         
         # Test empty string
-        result = deployer.convert_tags("")
-        self.assertEqual(result, "")
+        result = self.deployer.convert_tags("")
+        assert result == ""
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_get_server_types_no_location(self, mock_run):
+    def test_get_server_types_no_location(self):
         """Test get_server_types without location filter"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock realistic server type data
-        sample_data = [
-            {'name': 'cpx11'},
-            {'name': 'cpx21'},
-            {'name': 'cpx31'}
-        ]
-        
-        mock_run.return_value = (True, json.dumps(sample_data))
+        self.mock_run.return_value = (True, self.SERVER_TYPES_JSON)
         
-        result = deployer.get_server_types()
-        self.assertEqual(sorted(result), ['cpx11', 'cpx21', 'cpx31'])
+        result = self.deployer.get_server_types()
+        assert result == ['cpx11', 'cpx21', 'cpx31']
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_get_server_types_with_location(self, mock_run):
+    def test_get_server_types_with_location(self):
         """Test get_server_types with location filtering"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock realistic server type data with correct pricing structure
-        # The API returns 'location' field, not 'name' field in prices
-        sample_data = [
-            {
-                'name': 'cpx11',
-                'prices': [
-                    {'location': 'nbg1', 'price_hourly': {'net': '0.0063'}},
-                    {'location': 'fsn1', 'price_hourly': {'net': '0.0063'}}
-                ]
-            },
-            {
-                'name': 'cpx21', 
-                'prices': [
-                    {'location': 'nbg1', 'price_hourly': {'net': '0.0126'}},
-                    {'location': 'ash', 'price_hourly': {'net': '0.0126'}}
-                ]
-            },
-            {
-                'name': 'cpx31',
-                'prices': [
-                    {'location': 'ash', 'price_hourly': {'net': '0.0252'}}
-                ]
-            }
-        ]
-        
-        mock_run.return_value = (True, json.dumps(sample_data))
+        self.mock_run.return_value = (True, self.SERVER_TYPES_JSON)
         
         # Test with location filter for nbg1
-        result = deployer.get_server_types('nbg1')
-        self.assertEqual(sorted(result), ['cpx11', 'cpx21'])
+        result = self.deployer.get_server_types('nbg1')
+        assert result == ['cpx11', 'cpx21']
         
         # Test with location filter for ash
-        result = deployer.get_server_types('ash')
-        self.assertEqual(sorted(result), ['cpx21', 'cpx31'])
+        result = self.deployer.get_server_types('ash')
+        assert result == ['cpx21', 'cpx31']
         
         # Test with location filter for fsn1
-        result = deployer.get_server_types('fsn1')
-        self.assertEqual(result, ['cpx11'])
-
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_get_images(self, mock_run):
+        result = self.deployer.get_server_types('fsn1')
+        assert result == ['cpx11']
+
+        # The server type list is fetched once and filtered in memory
+        self.mock_run.assert_called_once_with(['server-type', 'list', '-o', 'json'], decode=False)
+
+    def test_metadata_cache_expires(self):
+        """Test that cached resource lists are refetched after METADATA_TTL"""
+        self.mock_run.return_value = (True, json.dumps([{'name': 'key-1'}]))
+
+        assert self.deployer.get_ssh_keys() == ['key-1']
+        assert self.deployer.get_ssh_keys() == ['key-1']
+        assert self.mock_run.call_count == 1
+
+        # Age the cached entry past the TTL
+        timestamp, data = self.deployer._meta_cache['ssh-key']
+        self.deployer._meta_cache['ssh-key'] = (timestamp - self.deployer.METADATA_TTL, data)
+
+        self.deployer.get_ssh_keys()
+        assert self.mock_run.call_count == 2
+
+    def test_prefetch_shares_server_type_fetch(self):
+        """Test that prefetched locations and server types share one API call"""
+        self.mock_run.return_value = (True, json.dumps([
+            {'name': 'cpx11', 'prices': [{'location': 'fsn1'}]}
+        ]))
+        args = Mock(image='ubuntu-22.04', interactive=True, location=None, server_type=None,
+                    ssh_key='key', firewall='fw', network='net')
+
+        prefetched = self.deployer.prefetch_metadata(args)
+        assert prefetched['locations'].result() == ['fsn1']
+        assert prefetched['server_types'].result() == ['cpx11']
+        assert self.deployer.get_server_types('fsn1') == ['cpx11']
+        self.mock_run.assert_called_once_with(['server-type', 'list', '-o', 'json'], decode=False)
+
+    def test_close_cancels_pending_prefetches(self):
+        """Test that close drops queued background work and releases the pool"""
+        deployer = self.deployer
+        release = threading.Event()
+        blockers = [deployer._submit(release.wait) for _ in range(6)]
+        queued = deployer._submit(lambda: None)
+
+        deployer.close()
+        release.set()
+
+        assert deployer._executor is None
+        if sys.version_info >= (3, 9):
+            assert queued.cancelled()
+        assert all(blocker.result() for blocker in blockers)
+
+    def test_get_images(self):
         """Test get_images method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock realistic image data
-        sample_data = [
-            {'name': 'ubuntu-22.04', 'type': 'system'},
-            {'name': 'ubuntu-20.04', 'type': 'system'},
-            {'name': 'debian-11', 'type': 'system'},
-            {'name': 'my-snapshot', 'type': 'snapshot'},  # Should be filtered out
-            {'name': 'centos-stream-9', 'type': 'system'},
-            {'name': 'windows-server-2019', 'type': 'system'}  # Should be filtered out
-        ]
-        
-        mock_run.return_value = (True, json.dumps(sample_data))
+        self.mock_run.return_value = (True, self.IMAGES_JSON)
         
-        result = deployer.get_images()
-        # Should only include Linux system images
+        result = self.deployer.get_images()
+        # Only Linux system images, already sorted by get_images
         expected = ['centos-stream-9', 'debian-11', 'ubuntu-20.04', 'ubuntu-22.04']
-        self.assertEqual(sorted(result), expected)
-
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_get_locations(self, mock_run):
-        """Test get_locations method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        sample_data = [
-            {'name': 'nbg1'},
-            {'name': 'fsn1'},
-            {'name': 'hel1'},
-            {'name': 'ash'}
-        ]
+        assert result == expected
+        # Snapshots and backups are filtered out by the API as well
+        self.mock_run.assert_called_once_with(['image', 'list', '--type', 'system', '-o', 'json'], decode=False)
+
+    def test_get_locations(self):
+        """Test get_locations derives locations from server type prices"""
+        self.mock_run.return_value = (True, self.SERVER_TYPES_JSON)
         
-        mock_run.return_value = (True, json.dumps(sample_data))
+        result = self.deployer.get_locations()
+        # Locations keep the order they first appear in
+        assert result == ['nbg1', 'fsn1', 'ash']
         
-        result = deployer.get_locations()
-        self.assertEqual(sorted(result), ['ash', 'fsn1', 'hel1', 'nbg1'])
+        # Server types for a location come from the same cached response
+        assert self.deployer.get_server_types('ash') == ['cpx21', 'cpx31']
+        self.mock_run.assert_called_once_with(['server-type', 'list', '-o', 'json'], decode=False)
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_get_ssh_keys(self, mock_run):
+    def test_get_ssh_keys(self):
         """Test get_ssh_keys method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        sample_data = [
-            {'name': 'my-key-1'},
-            {'name': 'my-key-2'},
-            {'name': 'backup-key'}
-        ]
-        
-        mock_run.return_value = (True, json.dumps(sample_data))
+        self.mock_run.return_value = (True, self.SSH_KEYS_JSON)
         
-        result = deployer.get_ssh_keys()
-        self.assertEqual(sorted(result), ['backup-key', 'my-key-1', 'my-key-2'])
+        result = self.deployer.get_ssh_keys()
+        assert result == ['my-key-1', 'my-key-2', 'backup-key']
 
     @patch('builtins.input')
     def test_select_from_list(self, mock_input):
         """Test select_from_list method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
         mock_input.return_value = '2'
         options = ['option1', 'option2', 'option3']
         
-        result = deployer.select_from_list("Choose:", options)
-        self.assertEqual(result, 'option2')
+        result = self.deployer.select_from_list("Choose:", options)
+        assert result == 'option2'
 
     @patch('builtins.input')
     def test_select_from_list_invalid_then_valid(self, mock_input):
         """Test select_from_list with invalid input then valid"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
         # First invalid (0), then invalid (4), then valid (1)
         mock_input.side_effect = ['0', '4', '1']
         options = ['option1', 'option2', 'option3']
-        
-        result = deployer.select_from_list("Choose:", options)
-        self.assertEqual(result, 'option1')
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    @patch('os.path.exists')
-    def test_upload_ssh_key(self, mock_exists, mock_run):
+        result = self.deployer.select_from_list("Choose:", options)
+        assert result == 'option1'
+
+    @patch('builtins.input')
+    def test_select_from_list_non_numeric_and_none(self, mock_input):
+        """Test select_from_list rejects non-numeric input and allows 0 for None"""
+        # '²' passes str.isdigit() but int() rejects it
+        mock_input.side_effect = ['abc', '-1', '²', '0']
+        result = self.deployer.select_from_list("Choose:", ['option1'], allow_none=True)
+        assert result is None
+        assert mock_input.call_count == 4
+
+    def test_upload_ssh_key(self):
         """Test upload_ssh_key method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
+        # No matching key on the account yet, then a successful upload
+        self.mock_run.side_effect = [(True, '[]'), (True, 'SSH key uploaded successfully')]
         
-        mock_exists.return_value = True
-        mock_run.return_value = (True, 'SSH key uploaded successfully')
+        with patch('builtins.open', mock_open(read_data='ssh-ed25519 AAAAC3Nz user@host\n')):
+            result = self.deployer.upload_ssh_key('/path/to/key.pub', False)
         
-        result = deployer.upload_ssh_key('test-server', '/path/to/key.pub', False)
+        assert self.mock_run.call_count == 2
+        assert self.mock_run.call_args.args[0][:2] == ['ssh-key', 'create']
         
-        # The method adds a timestamp suffix, so just check it starts correctly
-        self.assertTrue(result.startswith('test-server-key-'))
-        mock_run.assert_called_once()
+        # Named by a hash of the key alone, so any server deploying it gets the same name
+        assert result.startswith('deploy-key-')
+        self.mock_run.side_effect = [(True, '[]')]
+        with patch('builtins.open', mock_open(read_data='ssh-ed25519 AAAAC3Nz other@host\n')):
+            assert self.deployer.upload_ssh_key('/path/to/key.pub', True) == result
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_create_volume(self, mock_run):
-        """Test create_volume method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
+    def test_upload_ssh_key_reuses_existing(self):
+        """Test upload_ssh_key reuses a key already on the account"""
+        self.mock_run.return_value = (True, json.dumps([
+            {'name': 'laptop', 'public_key': 'ssh-ed25519 AAAAC3Nz other-comment'}
+        ]))
+        
+        with patch('builtins.open', mock_open(read_data='ssh-ed25519 AAAAC3Nz user@host\n')):
+            result = self.deployer.upload_ssh_key('/path/to/key.pub', False)
         
-        mock_run.return_value = (True, 'Volume created successfully')
+        assert result == 'laptop'
+        self.mock_run.assert_called_once_with(['ssh-key', 'list', '-o', 'json'], decode=False)
+
+    def test_create_volume(self):
+        """Test create_volume method"""
+        self.mock_run.return_value = (True, 'Volume created successfully')
         
-        result = deployer.create_volume('test-server', 10, 'nbg1', False)
+        result = self.deployer.create_volume('test-server', 10, 'nbg1', False)
         
-        self.assertEqual(result, 'test-server-volume')
-        mock_run.assert_called_once()
+        assert result == 'test-server-volume'
+        self.mock_run.assert_called_once()
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_deploy_server_dry_run(self, mock_run):
+    def test_deploy_server_dry_run(self):
         """Test deploy_server in dry run mode"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
         config = {
             'server_type': 'cpx21',
             'image': 'ubuntu-22.04',
@@ -299,196 +406,265 @@ class TestDeployFunctionsWithRealEnv(unittest.TestCase):
             'dry_run': True
         }
         
-        result = deployer.deploy_server('test-server', config)
+        result = self.deployer.deploy_server('test-server', config)
         
         # Should return True for dry run without calling hcloud
-        self.assertTrue(result)
-        mock_run.assert_not_called()
+        assert result
+        self.mock_run.assert_not_called()
+
+    @patch('deploy.os.path.exists')
+    def test_deploy_server_uses_cloud_config_flag(self, mock_exists):
+        """Test deploy_server trusts the precomputed cloud-config flag"""
+        self.mock_run.return_value = (False, 'error')
+        config = {
+            'server_type': 'cpx21',
+            'image': 'ubuntu-22.04',
+            'location': 'nbg1',
+            'cloud_config': 'cloud-init.yaml',
+            'cloud_config_exists': True,
+            'dry_run': False
+        }
+
+        self.deployer.deploy_server('test-server', config)
+
+        mock_exists.assert_not_called()
+        cmd = self.mock_run.call_args.args[0]
+        assert '--user-data-from-file' in cmd
+
+    @patch('deploy.HetznerDeployer._wait_for_server')
+    def test_deploy_server_uses_create_response(self, mock_wait):
+        """Test deploy_server reads the IP from the create response without polling"""
+        self.mock_run.return_value = (True, json.dumps({
+            'server': {'status': 'running', 'public_net': {'ipv4': {'ip': '192.0.2.10'}}}
+        }))
+        config = {
+            'server_type': 'cpx21',
+            'image': 'ubuntu-22.04',
+            'location': 'nbg1',
+            'dry_run': False
+        }
+
+        with patch('sys.stdout') as mock_stdout:
+            assert self.deployer.deploy_server('test-server', config)
+
+        self.mock_run.assert_called_once()
+        mock_wait.assert_not_called()
+        output = ''.join(call.args[0] for call in mock_stdout.write.call_args_list)
+        assert '192.0.2.10' in output
+
+    @patch('deploy._load_env_file', return_value={'HETZNER_TOKEN': 'test_token_123'})
+    def test_disk_cache_across_instances(self, mock_env):
+        """Test that catalog lists are reused from the on-disk cache between runs"""
+        from pathlib import Path
+        from tempfile import TemporaryDirectory
+
+        self.mock_run.return_value = (True, json.dumps([{'name': 'ubuntu-22.04', 'type': 'system'}]).encode())
+
+        with TemporaryDirectory() as cache_dir:
+            for _ in range(2):
+                deployer = deploy.HetznerDeployer()
+                deployer.cache_dir = Path(cache_dir)
+                assert deployer.get_images() == ['ubuntu-22.04']
+            self.mock_run.assert_called_once()
+
+            # Expired entries are fetched again
+            deployer = deploy.HetznerDeployer()
+            deployer.cache_dir = Path(cache_dir)
+            deployer.cache_ttl = 0
+            deployer.get_images()
+            assert self.mock_run.call_count == 2
+
+            # Lists outside DISK_CACHED never touch the disk
+            deployer.get_ssh_keys()
+            assert len(list(Path(cache_dir).iterdir())) == 1
+
+            # Changing the list flags changes the cache key
+            cached = deployer._disk_cache_path('image')
+            with patch.dict(deploy.HetznerDeployer.LIST_FLAGS, {'image': ['--type', 'snapshot']}):
+                assert deployer._disk_cache_path('image') != cached
+
+    @patch('deploy.time.sleep')
+    def test_wait_for_server_backoff(self, mock_sleep):
+        """Test _wait_for_server polls with growing delays until running"""
+        self.mock_run.side_effect = [
+            (True, json.dumps({'status': 'initializing'})),
+            (False, 'Error: server not found'),
+            (True, json.dumps({'status': 'starting'})),
+            (True, json.dumps({'status': 'running', 'public_net': {'ipv4': {'ip': '1.2.3.4'}}}))
+        ]
+
+        server_data = self.deployer._wait_for_server('test-server')
+
+        assert server_data['public_net']['ipv4']['ip'] == '1.2.3.4'
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.25, 0.5, 1]
+        self.mock_run.assert_called_with(['server', 'describe', 'test-server', '-o', 'json'], decode=False)
+
+    @patch('deploy.time.sleep')
+    def test_wait_for_server_timeout(self, mock_sleep):
+        """Test _wait_for_server gives up once the timeout is reached"""
+        self.mock_run.return_value = (True, json.dumps({'status': 'initializing'}))
+
+        assert self.deployer._wait_for_server('test-server', timeout=0) is None
+        self.mock_run.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('deploy.HetznerDeployer.deploy_server')
+    @patch('deploy.HetznerDeployer.create_volume')
+    def test_deploy_multiple_servers_with_volumes(self, mock_volume, mock_deploy):
+        """Test that each server in a parallel deploy gets its own volume"""
+        config = {
+            'name': 'web',
+            'count': 3,
+            'server_names': ['web-001', 'web-002', 'web-003'],
+            'server_type': 'cpx21',
+            'image': 'ubuntu-22.04',
+            'location': 'nbg1',
+            'volume_size': 10,
+            'dry_run': True
+        }
+        mock_volume.side_effect = lambda name, *args: f"{name}-volume"
+        mock_deploy.return_value = True
+
+        with patch.object(self.deployer, 'check_dependencies', return_value=True), \
+             patch.object(self.deployer, 'validate_token', return_value=True), \
+             patch.object(self.deployer, 'interactive_config', return_value=config):
+            result = self.deployer.deploy(Mock())
+
+        assert result
+        volumes = {call.args[0]: call.args[1]['volume_name'] for call in mock_deploy.call_args_list}
+        assert volumes == {
+            'web-001': 'web-001-volume',
+            'web-002': 'web-002-volume',
+            'web-003': 'web-003-volume'
+        }
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_check_dependencies(self, mock_run):
+    def test_check_dependencies(self):
         """Test check_dependencies method"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
         # Test when hcloud is available
-        mock_run.return_value = (True, 'hcloud version 1.0.0')
-        result = deployer.check_dependencies()
-        self.assertTrue(result)
+        self.mock_run.return_value = (True, 'hcloud version 1.0.0')
+        result = self.deployer.check_dependencies()
+        assert result
         
         # Test when hcloud is not available
-        mock_run.return_value = (False, 'hcloud CLI not found')
-        result = deployer.check_dependencies()
-        self.assertFalse(result)
+        self.mock_run.return_value = (False, 'hcloud CLI not found')
+        result = self.deployer.check_dependencies()
+        assert not result
 
 
-class TestEdgeCasesAndErrors(unittest.TestCase):
-    """Test error handling and edge cases"""
+class TestRunHcloudCommand(unittest.TestCase):
+    """Test the subprocess layer that the other test classes stub out"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build one deployer shared by every test in the class"""
+        with patch('deploy._load_env_file', return_value={'HETZNER_TOKEN': 'test_token_123'}):
+            cls.deployer = deploy.HetznerDeployer()
     
     def setUp(self):
-        """Set up test environment"""
-        env_content = 'HETZNER_TOKEN=test_token_123'
-        self.file_patcher = patch('builtins.open', mock_open(read_data=env_content))
-        self.file_patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.file_patcher.stop()
+        """Start from a clean module-wide subprocess.run mock"""
+        _subprocess_run.reset_mock(return_value=True, side_effect=True)
+        self.mock_run = _subprocess_run
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_empty_api_responses(self, mock_run):
-        """Test handling of empty API responses"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
+    def test_run_hcloud_command_success(self):
+        """Test successful hcloud command execution"""
+        self.mock_run.return_value = _RUN_OK
         
-        mock_run.return_value = (True, '[]')
+        success, output = self.deployer.run_hcloud_command(['server', 'list', '-o', 'json'])
         
-        self.assertEqual(deployer.get_server_types(), [])
-        self.assertEqual(deployer.get_images(), [])
-        self.assertEqual(deployer.get_locations(), [])
-
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_api_failure_responses(self, mock_run):
-        """Test handling of API failures"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
+        assert success
+        assert output == '{"servers": []}'
         
-        mock_run.return_value = (False, 'API Error: Authentication failed')
+        # JSON callers can skip the decode and get the raw bytes
+        success, output = self.deployer.run_hcloud_command(['server', 'list', '-o', 'json'], decode=False)
         
-        self.assertEqual(deployer.get_server_types(), [])
-        self.assertEqual(deployer.get_images(), [])
-        self.assertEqual(deployer.get_locations(), [])
+        assert success
+        assert output == b'{"servers": []}'
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_malformed_json_handling(self, mock_run):
-        """Test handling of malformed JSON responses"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock malformed JSON response
-        mock_run.return_value = (True, 'invalid json response')
+    def test_run_hcloud_command_failure(self):
+        """Test failed hcloud command execution"""
+        self.mock_run.return_value = _RUN_FAIL
         
-        # The actual methods should handle JSON parsing errors and return empty lists
-        # But since they don't have try/catch, we expect them to raise exceptions
-        # Let's test that they do raise exceptions for malformed JSON
-        with self.assertRaises(json.JSONDecodeError):
-            deployer.get_server_types()
+        success, output = self.deployer.run_hcloud_command(['server', 'list'])
         
-        with self.assertRaises(json.JSONDecodeError):
-            deployer.get_images()
-            
-        with self.assertRaises(json.JSONDecodeError):
-            deployer.get_locations()
+        assert not success
+        assert output == 'Error: invalid token'
 
-    @patch('deploy.HetznerDeployer.run_hcloud_command')
-    def test_malformed_json_handling_with_error(self, mock_run):
-        """Test handling of malformed JSON responses with error"""
-        import deploy
-        deployer = deploy.HetznerDeployer()
-        
-        # Mock failed API response - when success=False, methods return empty lists
-        mock_run.return_value = (False, 'Error: invalid json response')
-        
-        # When run_hcloud_command returns False, methods should return empty lists
-        self.assertEqual(deployer.get_server_types(), [])
-        self.assertEqual(deployer.get_images(), [])
-        self.assertEqual(deployer.get_locations(), [])
 
-class TestSSHUserDetection(unittest.TestCase):
-    """Test SSH user detection logic embedded in deploy_server"""
+class TestEdgeCasesAndErrors(unittest.TestCase):
+    """Test error handling and edge cases"""
     
-    def test_ssh_user_detection_logic(self):
-        """Test the SSH user detection logic"""
-        # This tests the logic found in the deploy_server method
-        test_cases = [
-            ('ubuntu-22.04', 'ubuntu'),
-            ('ubuntu-20.04', 'ubuntu'),
-            ('debian-11', 'debian'),
-            ('debian-12', 'debian'),
-            ('centos-stream-9', 'centos'),
-            ('rocky-linux-9', 'centos'),
-            ('almalinux-9', 'centos'),
-            ('fedora-37', 'fedora'),
-            ('opensuse-leap-15.4', 'opensuse'),
-            ('unknown-os', 'root')
-        ]
-        
-        for image_name, expected_user in test_cases:
-            # Replicate the logic from deploy_server method
-            image_lower = image_name.lower()
-            if 'ubuntu' in image_lower:
-                default_user = 'ubuntu'
-            elif 'debian' in image_lower:
-                default_user = 'debian'
-            elif 'centos' in image_lower or 'rocky' in image_lower or 'almalinux' in image_lower:
-                default_user = 'centos'
-            elif 'fedora' in image_lower:
-                default_user = 'fedora'
-            elif 'opensuse' in image_lower:
-                default_user = 'opensuse'
-            else:
-                default_user = 'root'
-            
-            self.assertEqual(default_user, expected_user, f"Failed for image: {image_name}")
+    @classmethod
+    def setUpClass(cls):
+        """Build one deployer shared by every test in the class"""
+        with patch('deploy._load_env_file', return_value={'HETZNER_TOKEN': 'test_token_123'}):
+            cls.deployer = deploy.HetznerDeployer()
+    
+    def setUp(self):
+        """Stub out hcloud calls and start every test with an empty metadata cache"""
+        patcher = patch.object(deploy.HetznerDeployer, 'run_hcloud_command')
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.deployer._meta_cache.clear()
 
+    def test_empty_api_responses(self):
+        """Test handling of empty API responses"""
+        self.mock_run.return_value = (True, '[]')
+        
+        assert self.deployer.get_server_types() == []
+        assert self.deployer.get_images() == []
+        assert self.deployer.get_locations() == []
 
-def run_all_tests():
-    """Run all tests with comprehensive summary"""
-    print("Running Corrected Deploy.py Test Suite")
-    print("=" * 60)
-    print("Using actual .env configuration for realistic testing")
-    print("=" * 60)
-    
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test cases
-    suite.addTests(loader.loadTestsFromTestCase(TestDeployFunctionsWithRealEnv))
-    suite.addTests(loader.loadTestsFromTestCase(TestEdgeCasesAndErrors))
-    suite.addTests(loader.loadTestsFromTestCase(TestSSHUserDetection))
-    
-    # Run tests with detailed output
-    runner = unittest.TextTestRunner(verbosity=2, buffer=True)
-    result = runner.run(suite)
-    
-    # Print comprehensive summary
-    print(f"\n{'='*60}")
-    print(f"COMPREHENSIVE TEST SUMMARY:")
-    print(f"{'='*60}")
-    print(f"  Total tests executed: {result.testsRun}")
-    print(f"  Successful tests: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"  Failed tests: {len(result.failures)}")
-    print(f"  Error tests: {len(result.errors)}")
-    
-    if result.failures:
-        print(f"\n  FAILED TESTS:")
-        for i, (test, traceback) in enumerate(result.failures, 1):
-            print(f"    {i}. ❌ {test}")
-    
-    if result.errors:
-        print(f"\n  ERROR TESTS:")
-        for i, (test, traceback) in enumerate(result.errors, 1):
-            print(f"    {i}. 💥 {test}")
-    
-    success_rate = ((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100) if result.testsRun > 0 else 0
-    
-    print(f"\n  SUCCESS RATE: {success_rate:.1f}%")
-    
-    if result.wasSuccessful():
-        print(f"  🎉 ALL TESTS PASSED! 🎉")
-        print(f"  ✅ Deploy.py functions are working correctly")
-        print(f"  ✅ Error handling is robust")
-        print(f"  ✅ API integration is properly mocked")
-    else:
-        print(f"  ⚠️  Some tests need attention")
-        print(f"  📝 Review failed/error tests above")
-    
-    print(f"{'='*60}")
-    
-    return result.wasSuccessful()
+    def test_api_failure_responses(self):
+        """Test handling of API failures"""
+        self.mock_run.return_value = (False, 'API Error: Authentication failed')
+        
+        assert self.deployer.get_server_types() == []
+        assert self.deployer.get_images() == []
+        assert self.deployer.get_locations() == []
+
+    def test_malformed_json_handling(self):
+        """Test malformed JSON raises while a failed call returns empty lists"""
+        methods = (
+            ('server_types', self.deployer.get_server_types),
+            ('images', self.deployer.get_images),
+            ('locations', self.deployer.get_locations)
+        )
+        
+        # The list methods don't catch JSON errors from a successful call
+        self.mock_run.return_value = (True, 'invalid json response')
+        for name, method in methods:
+            with self.subTest(name=name, success=True):
+                with pytest.raises(json.JSONDecodeError):
+                    method()
+        
+        # When run_hcloud_command returns False, methods should return empty lists
+        self.mock_run.return_value = (False, 'Error: invalid json response')
+        for name, method in methods:
+            with self.subTest(name=name, success=False):
+                assert method() == []
+
+
+# (image name, expected default SSH user)
+SSH_USER_CASES = [
+    ('ubuntu-22.04', 'ubuntu'),
+    ('ubuntu-20.04', 'ubuntu'),
+    ('debian-11', 'debian'),
+    ('debian-12', 'debian'),
+    ('centos-stream-9', 'centos'),
+    ('rocky-linux-9', 'centos'),
+    ('almalinux-9', 'centos'),
+    ('fedora-37', 'fedora'),
+    ('opensuse-leap-15.4', 'opensuse'),
+    ('Ubuntu-24.04', 'ubuntu'),
+    ('unknown-os', 'root')
+]
+
+
+@pytest.mark.parametrize('image_name,expected_user', SSH_USER_CASES)
+def test_ssh_user_detection(deployer, image_name, expected_user):
+    """Test SSH user detection used by deploy_server"""
+    assert deployer._detect_ssh_user(image_name) == expected_user
 
 
 if __name__ == '__main__':
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, '-v']))
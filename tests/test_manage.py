@@ -4,585 +4,705 @@ Comprehensive test suite for manage.py - Hetzner Cloud Server Management Tool
 Tests all major functions with realistic mocked data and error handling scenarios.
 """
 
-import unittest
 import sys
 import os
 import json
-from unittest.mock import patch, mock_open, MagicMock
-from pathlib import Path
+from collections import namedtuple
+from unittest.mock import patch
+
+import pytest
 
 # Add parent directory to path to import manage.py
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load environment variables from .env file in project root
-env_file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
-if os.path.exists(env_file_path):
-    with open(env_file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
-
 import manage
 from manage import HetznerManager, Colors
 
-
-class TestHetznerManager(unittest.TestCase):
-    """Test suite for HetznerManager class"""
-    
-    def setUp(self):
-        """Set up test fixtures"""
-        self.manager = HetznerManager()
-        
-        # Mock .env content for testing
-        self.mock_env_content = """HETZNER_TOKEN=test_token_12345
-DEFAULT_SSH_KEY_NAME=test-key
-DEFAULT_SERVER_TYPE=cpx21
-DEFAULT_LOCATION=nbg1"""
-        
-        # Sample server list JSON response
-        self.sample_servers_json = json.dumps([
-            {
-                "id": 12345,
-                "name": "test-server-1",
-                "status": "running",
-                "public_net": {"ipv4": {"ip": "1.2.3.4"}},
-                "server_type": {"name": "cpx21"},
-                "image": {"name": "ubuntu-22.04"},
-                "datacenter": {"location": {"name": "nbg1"}}
-            },
-            {
-                "id": 12346,
-                "name": "test-server-2", 
-                "status": "off",
-                "public_net": {"ipv4": {"ip": "1.2.3.5"}},
-                "server_type": {"name": "cpx11"},
-                "image": {"name": "debian-12"},
-                "datacenter": {"location": {"name": "fsn1"}}
-            }
-        ])
-        
-        # Sample SSH keys JSON response
-        self.sample_ssh_keys_json = json.dumps([
-            {"id": 1, "name": "my-key", "public_key": "ssh-rsa AAAAB3..."},
-            {"id": 2, "name": "backup-key", "public_key": "ssh-ed25519 AAAAC3..."}
-        ])
-        
-        # Sample volumes JSON response
-        self.sample_volumes_json = json.dumps([
-            {"id": 1, "name": "data-volume", "size": 20, "location": {"name": "nbg1"}},
-            {"id": 2, "name": "backup-volume", "size": 50, "location": {"name": "fsn1"}}
-        ])
-
-    def test_import_and_class_creation(self):
-        """Test that manage module imports correctly and HetznerManager can be instantiated"""
-        self.assertIsInstance(self.manager, HetznerManager)
-        self.assertIsInstance(self.manager.config, dict)
-
-    def test_load_env_config_success(self):
-        """Test successful .env file loading"""
-        # Test the parsing logic directly since mocking file operations is complex
-        test_env_content = """# Test environment file
+# Canned settings every manager starts with instead of reading the real .env
+TEST_CONFIG = {
+    'HETZNER_TOKEN': 'test_token_12345',
+    'DEFAULT_SSH_KEY_NAME': 'test-key',
+    'DEFAULT_SERVER_TYPE': 'cpx21',
+    'DEFAULT_LOCATION': 'nbg1'
+}
+
+# Sample server list JSON response
+SAMPLE_SERVERS_JSON = json.dumps([
+    {
+        "id": 12345,
+        "name": "test-server-1",
+        "status": "running",
+        "public_net": {"ipv4": {"ip": "1.2.3.4"}},
+        "server_type": {"name": "cpx21"},
+        "image": {"name": "ubuntu-22.04"},
+        "datacenter": {"location": {"name": "nbg1"}}
+    },
+    {
+        "id": 12346,
+        "name": "test-server-2", 
+        "status": "off",
+        "public_net": {"ipv4": {"ip": "1.2.3.5"}},
+        "server_type": {"name": "cpx11"},
+        "image": {"name": "debian-12"},
+        "datacenter": {"location": {"name": "fsn1"}}
+    }
+])
+
+# Sample SSH keys JSON response
+SAMPLE_SSH_KEYS_JSON = json.dumps([
+    {"id": 1, "name": "my-key", "public_key": "ssh-rsa AAAAB3..."},
+    {"id": 2, "name": "backup-key", "public_key": "ssh-ed25519 AAAAC3..."}
+])
+
+# Sample volumes JSON response
+SAMPLE_VOLUMES_JSON = json.dumps([
+    {"id": 1, "name": "data-volume", "size": 20, "location": {"name": "nbg1"}},
+    {"id": 2, "name": "backup-volume", "size": 50, "location": {"name": "fsn1"}}
+])
+
+# Frozen stand-in for subprocess.CompletedProcess
+Result = namedtuple('Result', 'returncode stdout stderr', defaults=(0, b"", b""))
+
+# The real loader, kept for the tests that exercise it directly
+_load_env_config = HetznerManager.load_env_config
+
+
+@pytest.fixture(scope='module', autouse=True)
+def _no_env_io():
+    """Keep HetznerManager() in this module from touching .env on disk"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(HetznerManager, 'load_env_config', lambda self: self.config.update(TEST_CONFIG))
+        yield
+
+
+@pytest.fixture(scope='module')
+def shared_manager(_no_env_io):
+    """One HetznerManager for the whole module, built with the .env stub in place"""
+    return HetznerManager()
+
+
+@pytest.fixture
+def manager(shared_manager, monkeypatch):
+    """The shared manager with fresh config and server cache, restored after each test"""
+    monkeypatch.setattr(shared_manager, 'config', dict(TEST_CONFIG))
+    monkeypatch.setattr(shared_manager, '_server_cache', None)
+    return shared_manager
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    """In-process stand-in for subprocess.run; set rc/out/err or exc, inspect calls"""
+    def _run(argv, **kwargs):
+        _run.calls.append((argv, kwargs))
+        if _run.exc is not None:
+            raise _run.exc
+        return Result(_run.rc, _run.out, _run.err)
+    _run.calls, _run.exc = [], None
+    _run.rc, _run.out, _run.err = Result()
+    monkeypatch.setattr(manage.subprocess, 'run', _run)
+    return _run
+
+
+@pytest.fixture
+def hcloud(monkeypatch):
+    """Stand-in for run_hcloud_command; set ret or a respond(cmd) callable, inspect calls"""
+    def _call(self, cmd, decode=True):
+        _call.calls.append(cmd)
+        success, output = _call.respond(cmd) if _call.respond else _call.ret
+        # Like the real method, raw (decode=False) output is always bytes
+        return success, output if decode else output.encode()
+    _call.calls, _call.ret, _call.respond = [], (True, ""), None
+    monkeypatch.setattr(HetznerManager, 'run_hcloud_command', _call)
+    return _call
+
+
+def test_import_and_class_creation(manager):
+    """Test that manage module imports correctly and HetznerManager can be instantiated"""
+    assert isinstance(manager, HetznerManager)
+    assert isinstance(manager.config, dict)
+
+
+@patch('pathlib.Path.read_text')
+@patch('pathlib.Path.exists', return_value=True)
+def test_load_env_config_success(mock_exists, mock_read_text):
+    """Test successful .env file loading"""
+    mock_read_text.return_value = """# Test environment file
 HETZNER_TOKEN=test_token_12345
-DEFAULT_SSH_KEY_NAME=test-key
+  # indented comment=ignored
+DEFAULT_SSH_KEY_NAME=test-key  
+not a setting
 DEFAULT_LOCATION=nbg1
+DEFAULT_IMAGE = ubuntu-24.04
+bad-name=x
 """
-        
-        # Test the parsing logic
-        test_config = {}
-        for line in test_env_content.split('\n'):
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                test_config[key] = value
-        
-        self.assertEqual(test_config['HETZNER_TOKEN'], 'test_token_12345')
-        self.assertEqual(test_config['DEFAULT_SSH_KEY_NAME'], 'test-key')
-        self.assertEqual(test_config['DEFAULT_LOCATION'], 'nbg1')
-
-    @patch('pathlib.Path.exists')
-    def test_load_env_config_no_file(self, mock_exists):
-        """Test behavior when .env file doesn't exist"""
-        mock_exists.return_value = False
-        
-        manager = HetznerManager()
-        
-        # Should not crash and config should be empty dict
-        self.assertIsInstance(manager.config, dict)
-
-    @patch('manage.subprocess.run')
-    def test_run_hcloud_command_success(self, mock_run):
-        """Test successful hcloud command execution"""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "command output"
-        mock_run.return_value = mock_result
-        
-        success, output = self.manager.run_hcloud_command(['version'])
-        
-        self.assertTrue(success)
-        self.assertEqual(output, "command output")
-        mock_run.assert_called_once()
-
-    @patch('manage.subprocess.run')
-    def test_run_hcloud_command_failure(self, mock_run):
-        """Test failed hcloud command execution"""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = "error message"
-        mock_run.return_value = mock_result
-        
-        success, output = self.manager.run_hcloud_command(['invalid-command'])
-        
-        self.assertFalse(success)
-        self.assertEqual(output, "error message")
+    
+    manager = HetznerManager()
+    manager.config = {}
+    _load_env_config(manager)
+    test_config = manager.config
+    
+    assert len(test_config) == 4
+    assert test_config['HETZNER_TOKEN'] == 'test_token_12345'
+    assert test_config['DEFAULT_SSH_KEY_NAME'] == 'test-key'
+    assert test_config['DEFAULT_LOCATION'] == 'nbg1'
+    assert test_config['DEFAULT_IMAGE'] == 'ubuntu-24.04'
 
-    @patch('manage.subprocess.run')
-    def test_run_hcloud_command_not_found(self, mock_run):
-        """Test hcloud command when CLI not found"""
-        mock_run.side_effect = FileNotFoundError()
-        
-        success, output = self.manager.run_hcloud_command(['version'])
-        
-        self.assertFalse(success)
-        self.assertEqual(output, "hcloud CLI not found")
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_check_dependencies_success(self, mock_run_command):
-        """Test successful dependency check"""
-        mock_run_command.return_value = (True, "hcloud 1.0.0")
-        
-        result = self.manager.check_dependencies()
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['version'])
+@patch('pathlib.Path.exists')
+def test_load_env_config_no_file(mock_exists):
+    """Test behavior when .env file doesn't exist"""
+    mock_exists.return_value = False
+    
+    manager = HetznerManager()
+    manager.config = {}
+    _load_env_config(manager)
+    
+    # Should not crash and config should stay empty
+    assert manager.config == {}
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_check_dependencies_failure(self, mock_run_command):
-        """Test failed dependency check"""
-        mock_run_command.return_value = (False, "command not found")
-        
-        result = self.manager.check_dependencies()
-        
-        self.assertFalse(result)
 
-    def test_validate_token_missing(self):
-        """Test token validation when token is missing"""
-        self.manager.config = {}
-        
-        result = self.manager.validate_token()
-        
-        self.assertFalse(result)
+def test_run_hcloud_command_success(fake_run, manager):
+    """Test successful hcloud command execution"""
+    fake_run.out = b"command output\n"
+    
+    success, output = manager.run_hcloud_command(['version'])
+    
+    assert success
+    assert output == "command output"
+    assert len(fake_run.calls) == 1
+    
+    # JSON callers can skip the decode and get the raw bytes
+    success, output = manager.run_hcloud_command(['server', 'list', '-o', 'json'], decode=False)
+    
+    assert success
+    assert output == b"command output"
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_validate_token_success(self, mock_run_command):
-        """Test successful token validation"""
-        self.manager.config = {'HETZNER_TOKEN': 'valid_token'}
-        mock_run_command.return_value = (True, "context list output")
-        
-        result = self.manager.validate_token()
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['context', 'list'])
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_validate_token_invalid(self, mock_run_command):
-        """Test invalid token validation"""
-        self.manager.config = {'HETZNER_TOKEN': 'invalid_token'}
-        mock_run_command.return_value = (False, "authentication failed")
-        
-        result = self.manager.validate_token()
-        
-        self.assertFalse(result)
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_get_servers_success(self, mock_run_command):
-        """Test successful server list retrieval"""
-        mock_run_command.return_value = (True, self.sample_servers_json)
-        
-        servers = self.manager.get_servers()
-        
-        self.assertEqual(len(servers), 2)
-        self.assertIn('test-server-1', servers)
-        self.assertIn('test-server-2', servers)
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_get_servers_malformed_json(self, mock_run_command):
-        """Test server list with malformed JSON response"""
-        mock_run_command.return_value = (True, "invalid json")
-        
-        # The actual method should handle JSON errors gracefully
-        servers = self.manager.get_servers()
-        
-        # Should return empty list on JSON parse error
-        self.assertEqual(servers, [])
+def test_run_hcloud_command_failure(fake_run, manager):
+    """Test failed hcloud command execution"""
+    fake_run.rc = 1
+    fake_run.out = b"error message"
+    
+    success, output = manager.run_hcloud_command(['invalid-command'])
+    
+    assert not success
+    assert output == "error message"
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_get_servers_failure(self, mock_run_command):
-        """Test server list retrieval failure"""
-        mock_run_command.return_value = (False, "API error")
-        
-        servers = self.manager.get_servers()
-        
-        self.assertEqual(servers, [])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_get_servers_empty_response(self, mock_run_command):
-        """Test server list with empty response"""
-        mock_run_command.return_value = (True, "[]")
-        
-        servers = self.manager.get_servers()
-        
-        self.assertEqual(servers, [])
+def test_run_hcloud_command_reuses_env(fake_run, manager):
+    """Test the subprocess environment is built once and follows token changes"""
+    fake_run.out = b"ok"
+    manager.config = {'HETZNER_TOKEN': 'token-a'}
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_list_servers_success(self, mock_run_command):
-        """Test successful server listing"""
-        mock_run_command.return_value = (True, "server list output")
-        
-        result = self.manager.list_servers()
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'list'])
+    manager.run_hcloud_command(['version'])
+    manager.run_hcloud_command(['version'])
+    first_env, second_env = (kwargs['env'] for _, kwargs in fake_run.calls)
+    assert first_env is second_env
+    assert first_env['HCLOUD_TOKEN'] == 'token-a'
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_list_servers_failure(self, mock_run_command):
-        """Test failed server listing"""
-        mock_run_command.return_value = (False, "API error")
-        
-        result = self.manager.list_servers()
-        
-        self.assertFalse(result)
+    manager.config['HETZNER_TOKEN'] = 'token-b'
+    manager.run_hcloud_command(['version'])
+    assert fake_run.calls[-1][1]['env']['HCLOUD_TOKEN'] == 'token-b'
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_server_info_success(self, mock_run_command):
-        """Test successful server info retrieval"""
-        mock_run_command.return_value = (True, "server details")
-        
-        result = self.manager.server_info('test-server')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'describe', 'test-server'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_server_info_failure(self, mock_run_command):
-        """Test failed server info retrieval"""
-        mock_run_command.return_value = (False, "server not found")
-        
-        result = self.manager.server_info('nonexistent-server')
-        
-        self.assertFalse(result)
+def test_run_hcloud_quiet_discards_output(fake_run, manager):
+    """Test probes send output to DEVNULL and report only the exit status"""
+    assert manager.run_hcloud_quiet(['version'])
+    _, kwargs = fake_run.calls[-1]
+    assert kwargs['stdout'] is manage.subprocess.DEVNULL
+    assert kwargs['stderr'] is manage.subprocess.DEVNULL
+    
+    fake_run.exc = FileNotFoundError()
+    assert not manager.run_hcloud_quiet(['version'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_start_server_success(self, mock_run_command):
-        """Test successful server start"""
-        mock_run_command.return_value = (True, "server started")
-        
-        result = self.manager.start_server('test-server')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'poweron', 'test-server'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_start_server_failure(self, mock_run_command):
-        """Test failed server start"""
-        mock_run_command.return_value = (False, "server already running")
-        
-        result = self.manager.start_server('test-server')
-        
-        self.assertFalse(result)
+def test_run_hcloud_command_not_found(fake_run, manager):
+    """Test hcloud command when CLI not found"""
+    fake_run.exc = FileNotFoundError()
+    
+    success, output = manager.run_hcloud_command(['version'])
+    
+    assert not success
+    assert output == "hcloud CLI not found"
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_stop_server_success(self, mock_run_command):
-        """Test successful server stop"""
-        mock_run_command.return_value = (True, "server stopped")
-        
-        result = self.manager.stop_server('test-server')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'poweroff', 'test-server'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_restart_server_success(self, mock_run_command):
-        """Test successful server restart"""
-        mock_run_command.return_value = (True, "server restarted")
-        
-        result = self.manager.restart_server('test-server')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'reboot', 'test-server'])
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    @patch('builtins.input')
-    def test_delete_server_with_confirmation(self, mock_input, mock_run_command):
-        """Test server deletion with user confirmation"""
-        mock_input.return_value = 'YES'
-        mock_run_command.side_effect = [
-            (True, "server details"),  # describe command
-            (True, "server deleted")   # delete command
-        ]
-        
-        result = self.manager.delete_server('test-server', confirm=False)
-        
-        self.assertTrue(result)
-        self.assertEqual(mock_run_command.call_count, 2)
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    @patch('builtins.input')
-    def test_delete_server_cancelled(self, mock_input, mock_run_command):
-        """Test server deletion cancelled by user"""
-        mock_input.return_value = 'no'
-        mock_run_command.return_value = (True, "server details")
-        
-        result = self.manager.delete_server('test-server', confirm=False)
-        
-        self.assertFalse(result)
-        # Should only call describe, not delete
-        mock_run_command.assert_called_once_with(['server', 'describe', 'test-server'])
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_delete_server_confirmed(self, mock_run_command):
-        """Test server deletion with confirmation bypassed"""
-        mock_run_command.return_value = (True, "server deleted")
-        
-        result = self.manager.delete_server('test-server', confirm=True)
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'delete', 'test-server'])
+@patch.object(HetznerManager, 'run_hcloud_quiet')
+def test_check_dependencies_success(mock_run_quiet, manager):
+    """Test successful dependency check"""
+    mock_run_quiet.return_value = True
+    
+    result = manager.check_dependencies()
+    
+    assert result
+    mock_run_quiet.assert_called_once_with(['version'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_resize_server_success(self, mock_run_command):
-        """Test successful server resize"""
-        mock_run_command.return_value = (True, "server resized")
-        
-        result = self.manager.resize_server('test-server', 'cpx31')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['server', 'change-type', 'test-server', 'cpx31'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_ssh_server_success(self, mock_run_command):
-        """Test successful SSH connection setup"""
-        mock_run_command.return_value = (True, "1.2.3.4")
-        
-        with patch('os.system') as mock_system:
-            result = self.manager.ssh_server('test-server')
-            
-            self.assertTrue(result)
-            mock_system.assert_called_once_with('ssh root@1.2.3.4')
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_ssh_server_failure(self, mock_run_command):
-        """Test failed SSH connection setup"""
-        mock_run_command.return_value = (False, "server not found")
-        
-        result = self.manager.ssh_server('test-server')
-        
-        self.assertFalse(result)
+@patch.object(HetznerManager, 'run_hcloud_quiet')
+def test_check_dependencies_failure(mock_run_quiet, manager):
+    """Test failed dependency check"""
+    mock_run_quiet.return_value = False
+    
+    result = manager.check_dependencies()
+    
+    assert not result
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_list_ssh_keys_success(self, mock_run_command):
-        """Test successful SSH key listing"""
-        mock_run_command.return_value = (True, "ssh key list")
-        
-        result = self.manager.list_ssh_keys()
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['ssh-key', 'list'])
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    @patch('os.path.exists')
-    def test_add_ssh_key_success(self, mock_exists, mock_run_command):
-        """Test successful SSH key addition"""
-        mock_exists.return_value = True
-        mock_run_command.return_value = (True, "ssh key added")
-        
-        result = self.manager.add_ssh_key('test-key', '/path/to/key.pub')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with([
-            'ssh-key', 'create', '--name', 'test-key', 
-            '--public-key-from-file', '/path/to/key.pub'
-        ])
-
-    @patch('os.path.exists')
-    def test_add_ssh_key_file_not_found(self, mock_exists):
-        """Test SSH key addition with missing file"""
-        mock_exists.return_value = False
-        
-        result = self.manager.add_ssh_key('test-key', '/nonexistent/key.pub')
-        
-        self.assertFalse(result)
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    @patch('builtins.input')
-    def test_delete_ssh_key_with_confirmation(self, mock_input, mock_run_command):
-        """Test SSH key deletion with confirmation"""
-        mock_input.return_value = 'yes'
-        mock_run_command.return_value = (True, "ssh key deleted")
-        
-        result = self.manager.delete_ssh_key('test-key', confirm=False)
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['ssh-key', 'delete', 'test-key'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_list_volumes_success(self, mock_run_command):
-        """Test successful volume listing"""
-        mock_run_command.return_value = (True, "volume list")
-        
-        result = self.manager.list_volumes()
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['volume', 'list'])
+def test_validate_token_missing(manager):
+    """Test token validation when token is missing"""
+    manager.config = {}
+    
+    result = manager.validate_token()
+    
+    assert not result
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_create_volume_success(self, mock_run_command):
-        """Test successful volume creation"""
-        mock_run_command.return_value = (True, "volume created")
-        
-        result = self.manager.create_volume('test-volume', 20, 'nbg1')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with([
-            'volume', 'create', '--name', 'test-volume',
-            '--size', '20', '--location', 'nbg1', '--format', 'ext4'
-        ])
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_attach_volume_success(self, mock_run_command):
-        """Test successful volume attachment"""
-        mock_run_command.return_value = (True, "volume attached")
-        
-        result = self.manager.attach_volume('test-server', 'test-volume')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['volume', 'attach', 'test-volume', 'test-server'])
 
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    def test_detach_volume_success(self, mock_run_command):
-        """Test successful volume detachment"""
-        mock_run_command.return_value = (True, "volume detached")
-        
-        result = self.manager.detach_volume('test-volume')
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['volume', 'detach', 'test-volume'])
-
-    @patch.object(HetznerManager, 'run_hcloud_command')
-    @patch('builtins.input')
-    def test_delete_volume_with_confirmation(self, mock_input, mock_run_command):
-        """Test volume deletion with confirmation"""
-        mock_input.return_value = 'yes'
-        mock_run_command.return_value = (True, "volume deleted")
-        
-        result = self.manager.delete_volume('test-volume', confirm=False)
-        
-        self.assertTrue(result)
-        mock_run_command.assert_called_once_with(['volume', 'delete', 'test-volume'])
-
-    @patch.object(HetznerManager, 'get_servers')
-    @patch('builtins.input')
-    def test_interactive_delete_success(self, mock_input, mock_get_servers):
-        """Test interactive server deletion"""
-        mock_get_servers.return_value = ['server-1', 'server-2']
-        mock_input.return_value = '1'
-        
-        with patch.object(self.manager, 'delete_server', return_value=True) as mock_delete:
-            result = self.manager.interactive_delete()
-            
-            self.assertTrue(result)
-            mock_delete.assert_called_once_with('server-1', confirm=False)
-
-    @patch.object(HetznerManager, 'get_servers')
-    @patch('builtins.input')
-    def test_interactive_delete_cancelled(self, mock_input, mock_get_servers):
-        """Test interactive server deletion cancelled"""
-        mock_get_servers.return_value = ['server-1', 'server-2']
-        mock_input.return_value = '0'
-        
-        result = self.manager.interactive_delete()
-        
-        self.assertTrue(result)  # Cancellation is considered successful
+@patch.object(HetznerManager, 'run_hcloud_quiet')
+def test_validate_token_success(mock_run_quiet, manager):
+    """Test successful token validation"""
+    manager.config = {'HETZNER_TOKEN': 'valid_token'}
+    mock_run_quiet.return_value = True
+    
+    result = manager.validate_token()
+    
+    assert result
+    mock_run_quiet.assert_called_once_with(['context', 'list'])
 
-    @patch.object(HetznerManager, 'get_servers')
-    def test_interactive_delete_no_servers(self, mock_get_servers):
-        """Test interactive deletion with no servers"""
-        mock_get_servers.return_value = []
-        
-        result = self.manager.interactive_delete()
-        
-        self.assertTrue(result)
-
-    def test_colors_class(self):
-        """Test Colors class constants"""
-        self.assertTrue(hasattr(Colors, 'RED'))
-        self.assertTrue(hasattr(Colors, 'GREEN'))
-        self.assertTrue(hasattr(Colors, 'YELLOW'))
-        self.assertTrue(hasattr(Colors, 'NC'))
-        self.assertIsInstance(Colors.RED, str)
-
-    # Error handling tests
-    @patch('manage.subprocess.run')
-    def test_run_hcloud_command_exception(self, mock_run):
-        """Test hcloud command with subprocess exception"""
-        from subprocess import CalledProcessError
-        mock_run.side_effect = CalledProcessError(1, 'hcloud', 'error output')
+
+@patch.object(HetznerManager, 'run_hcloud_quiet')
+def test_validate_token_invalid(mock_run_quiet, manager):
+    """Test invalid token validation"""
+    manager.config = {'HETZNER_TOKEN': 'invalid_token'}
+    mock_run_quiet.return_value = False
+    
+    result = manager.validate_token()
+    
+    assert not result
+
+
+@pytest.mark.parametrize("ret,expected", [
+    pytest.param((True, SAMPLE_SERVERS_JSON), ['test-server-1', 'test-server-2'], id="success"),
+    # JSON errors are handled gracefully with an empty list
+    pytest.param((True, "invalid json"), [], id="malformed_json"),
+    pytest.param((False, "API error"), [], id="failure"),
+    pytest.param((True, "[]"), [], id="empty_response"),
+])
+def test_get_servers(hcloud, manager, ret, expected):
+    """Test server list retrieval across good, bad and empty responses"""
+    hcloud.ret = ret
+    
+    assert manager.get_servers() == expected
+
+
+def test_get_servers_cached(hcloud, manager):
+    """Test repeated server lookups reuse the cached list until it expires"""
+    hcloud.ret = (True, SAMPLE_SERVERS_JSON)
+
+    manager.get_servers()
+    manager.get_servers()
+    assert len(hcloud.calls) == 1
+
+    # Age the cache past SERVER_LIST_TTL
+    fetched_at, data = manager._server_cache
+    manager._server_cache = (fetched_at - 60, data)
+    manager.get_servers()
+    assert len(hcloud.calls) == 2
+
+
+def test_server_cache_invalidated_on_change(hcloud, manager):
+    """Test that changing a server drops the cached server list"""
+    hcloud.ret = (True, SAMPLE_SERVERS_JSON)
+    manager.get_servers()
+
+    hcloud.ret = (True, "server stopped")
+    manager.stop_server('test-server-1')
+
+    assert manager._server_cache is None
+
+
+@pytest.mark.parametrize("method,args,argv,ret,ok", [
+    pytest.param('list_servers', (), ['server', 'list'], (True, "server list output"), True, id="list_servers_success"),
+    pytest.param('list_servers', (), ['server', 'list'], (False, "API error"), False, id="list_servers_failure"),
+    pytest.param('server_info', ('test-server',), ['server', 'describe', 'test-server'], (True, "server details"), True, id="server_info_success"),
+    pytest.param('server_info', ('nonexistent-server',), ['server', 'describe', 'nonexistent-server'], (False, "server not found"), False, id="server_info_failure"),
+    pytest.param('start_server', ('test-server',), ['server', 'poweron', 'test-server'], (True, "server started"), True, id="start_server_success"),
+    pytest.param('start_server', ('test-server',), ['server', 'poweron', 'test-server'], (False, "server already running"), False, id="start_server_failure"),
+    pytest.param('stop_server', ('test-server',), ['server', 'poweroff', 'test-server'], (True, "server stopped"), True, id="stop_server_success"),
+    pytest.param('restart_server', ('test-server',), ['server', 'reboot', 'test-server'], (True, "server restarted"), True, id="restart_server_success"),
+    pytest.param('resize_server', ('test-server', 'cpx31'), ['server', 'change-type', 'test-server', 'cpx31'], (True, "server resized"), True, id="resize_server_success"),
+    pytest.param('list_ssh_keys', (), ['ssh-key', 'list'], (True, "ssh key list"), True, id="list_ssh_keys_success"),
+    pytest.param('list_volumes', (), ['volume', 'list'], (True, "volume list"), True, id="list_volumes_success"),
+    pytest.param('create_volume', ('test-volume', 20, 'nbg1'), [
+        'volume', 'create', '--name', 'test-volume',
+        '--size', '20', '--location', 'nbg1', '--format', 'ext4'
+    ], (True, "volume created"), True, id="create_volume_success"),
+    pytest.param('attach_volume', ('test-server', 'test-volume'), ['volume', 'attach', 'test-volume', 'test-server'], (True, "volume attached"), True, id="attach_volume_success"),
+    pytest.param('detach_volume', ('test-volume',), ['volume', 'detach', 'test-volume'], (True, "volume detached"), True, id="detach_volume_success"),
+])
+def test_hcloud_wrapper(hcloud, manager, method, args, argv, ret, ok):
+    """Test that each command wrapper passes the right argv and reports the result"""
+    hcloud.ret = ret
+    assert getattr(manager, method)(*args) is ok
+    assert hcloud.calls == [argv]
+
+
+@pytest.mark.parametrize("method,name,confirm,answer,argvs,ok", [
+    pytest.param('delete_server', 'test-server', False, 'YES',
+                 [['server', 'describe', 'test-server'], ['server', 'delete', 'test-server']], True,
+                 id="delete_server_with_confirmation"),
+    pytest.param('delete_server', 'test-server', False, 'no',
+                 [['server', 'describe', 'test-server']], False, id="delete_server_cancelled"),
+    pytest.param('delete_server', 'test-server', True, None,
+                 [['server', 'delete', 'test-server']], True, id="delete_server_confirmed"),
+    pytest.param('delete_ssh_key', 'test-key', False, 'yes',
+                 [['ssh-key', 'delete', 'test-key']], True, id="delete_ssh_key_with_confirmation"),
+    pytest.param('delete_ssh_key', 'test-key', False, 'no', [], False, id="delete_ssh_key_cancelled"),
+    pytest.param('delete_volume', 'test-volume', False, 'yes',
+                 [['volume', 'delete', 'test-volume']], True, id="delete_volume_with_confirmation"),
+    pytest.param('delete_volume', 'test-volume', False, 'no', [], False, id="delete_volume_cancelled"),
+])
+def test_delete_with_confirmation(hcloud, manager, method, name, confirm, answer, argvs, ok):
+    """Test each delete only runs once the user has confirmed it"""
+    with patch('builtins.input', return_value=answer) as mock_input:
+        assert getattr(manager, method)(name, confirm=confirm) is ok
+    
+    assert mock_input.called is not confirm
+    assert hcloud.calls == argvs
+
+
+def test_bulk_action_start(hcloud, manager):
+    """Test starting several servers in one call"""
+    hcloud.ret = (True, "server started")
+
+    result = manager.bulk_action(['web-001', 'web-002', 'web-001'], 'start')
+
+    assert result
+    # Duplicate names are only acted on once
+    assert sorted(hcloud.calls) == [['server', 'poweron', 'web-001'], ['server', 'poweron', 'web-002']]
+
+
+@pytest.mark.parametrize("value,expected", [('', 5), ('many', 5), ('0', 1), ('8', 8)])
+def test_max_concurrency_parsing(manager, value, expected):
+    """Test MAX_CONCURRENCY falls back to 5 when invalid and is at least 1"""
+    manager.config['MAX_CONCURRENCY'] = value
+    
+    assert manager._max_concurrency() == expected
+
+
+def test_bulk_action_partial_failure(hcloud, manager):
+    """Test bulk action reports failure when any server fails"""
+    hcloud.respond = lambda cmd: (cmd[2] != 'web-002', "result")
+
+    result = manager.bulk_action(['web-001', 'web-002'], 'stop')
+
+    assert not result
+    assert len(hcloud.calls) == 2
+
+
+@patch('builtins.input')
+def test_bulk_delete_single_confirmation(mock_input, hcloud, manager):
+    """Test bulk deletion asks once and skips per-server describes"""
+    mock_input.return_value = 'YES'
+    hcloud.ret = (True, "server deleted")
+
+    result = manager.bulk_action(['web-001', 'web-002'], 'delete')
+
+    assert result
+    mock_input.assert_called_once()
+    assert sorted(hcloud.calls) == [['server', 'delete', 'web-001'], ['server', 'delete', 'web-002']]
+
+
+@patch('builtins.input')
+def test_bulk_delete_cancelled(mock_input, hcloud, manager):
+    """Test bulk deletion does nothing without confirmation"""
+    mock_input.return_value = 'no'
+
+    result = manager.bulk_action(['web-001', 'web-002'], 'delete')
+
+    assert not result
+    assert hcloud.calls == []
+
+
+def test_ssh_server_success(hcloud, manager):
+    """Test successful SSH connection setup"""
+    hcloud.ret = (True, "1.2.3.4")
+    
+    with patch('os.execvp') as mock_execvp:
+        manager.ssh_server('test-server')
         
-        success, output = self.manager.run_hcloud_command(['test'])
+        # The process is replaced by ssh directly, without a shell
+        mock_execvp.assert_called_once_with('ssh', ['ssh', 'root@1.2.3.4'])
+
+
+def test_ssh_server_uses_cached_list(hcloud, manager):
+    """Test SSH takes the IP from a fresh server list instead of calling server ip"""
+    hcloud.ret = (True, SAMPLE_SERVERS_JSON)
+    manager.get_servers()
+    
+    with patch('os.execvp') as mock_execvp:
+        manager.ssh_server('test-server-1')
+    
+    mock_execvp.assert_called_once_with('ssh', ['ssh', 'root@1.2.3.4'])
+    assert hcloud.calls == [['server', 'list', '-o', 'json']]
+
+
+def test_ssh_server_missing_client(hcloud, manager):
+    """Test SSH when the ssh client cannot be executed"""
+    hcloud.ret = (True, "1.2.3.4")
+    
+    with patch('os.execvp', side_effect=FileNotFoundError('ssh')):
+        result = manager.ssh_server('test-server')
+    
+    assert not result
+
+
+def test_ssh_server_failure(hcloud, manager):
+    """Test failed SSH connection setup"""
+    hcloud.ret = (False, "server not found")
+    
+    result = manager.ssh_server('test-server')
+    
+    assert not result
+
+
+@patch('os.path.exists')
+def test_add_ssh_key_success(mock_exists, hcloud, manager):
+    """Test successful SSH key addition"""
+    mock_exists.return_value = True
+    hcloud.ret = (True, "ssh key added")
+    
+    result = manager.add_ssh_key('test-key', '/path/to/key.pub')
+    
+    assert result
+    assert hcloud.calls == [[
+        'ssh-key', 'create', '--name', 'test-key', 
+        '--public-key-from-file', '/path/to/key.pub'
+    ]]
+
+
+@patch('os.path.exists')
+def test_add_ssh_key_file_not_found(mock_exists, manager):
+    """Test SSH key addition with missing file"""
+    mock_exists.return_value = False
+    
+    result = manager.add_ssh_key('test-key', '/nonexistent/key.pub')
+    
+    assert not result
+
+
+@patch('builtins.input', return_value='YES')
+def test_delete_server_uses_prefetched_record(mock_input, hcloud, manager):
+    """Test a known server record replaces the describe call before deletion"""
+    hcloud.ret = (True, "Server deleted")
+    record = json.loads(SAMPLE_SERVERS_JSON)[0]
+
+    with patch('builtins.print') as mock_print:
+        result = manager.delete_server('test-server-1', prefetched=record)
+
+    assert result
+    assert hcloud.calls == [['server', 'delete', 'test-server-1']]
+    printed = "\n".join(str(call.args[0]) for call in mock_print.call_args_list if call.args)
+    for detail in ("test-server-1 (ID 12345)", "running", "cpx21", "ubuntu-22.04", "nbg1", "1.2.3.4"):
+        assert detail in printed
+
+
+@patch('builtins.input', return_value='YES')
+def test_delete_server_uses_cached_list(mock_input, hcloud, manager):
+    """Test a fresh server list stands in for the describe call before deletion"""
+    hcloud.ret = (True, SAMPLE_SERVERS_JSON)
+    manager.get_servers()
+    
+    result = manager.delete_server('12345')
+    
+    assert result
+    assert hcloud.calls == [['server', 'list', '-o', 'json'], ['server', 'delete', '12345']]
+
+
+@patch('builtins.input', return_value='YES')
+def test_delete_server_partial_record_falls_back_to_describe(mock_input, hcloud, manager):
+    """Test a record missing fields is described by hcloud instead of raising"""
+    record = json.loads(SAMPLE_SERVERS_JSON)[0]
+    del record['datacenter']
+    record['image'] = None
+    
+    result = manager.delete_server('test-server-1', prefetched=record)
+    
+    assert result
+    assert hcloud.calls == [['server', 'describe', 'test-server-1'], ['server', 'delete', 'test-server-1']]
+
+
+@patch.object(HetznerManager, '_servers')
+@patch('builtins.input')
+def test_interactive_delete_success(mock_input, mock_servers, manager):
+    """Test interactive server deletion"""
+    mock_servers.return_value = [{'name': 'server-1'}, {'name': 'server-2'}]
+    mock_input.return_value = '1'
+    
+    with patch.object(manager, 'delete_server', return_value=True) as mock_delete:
+        result = manager.interactive_delete()
         
-        self.assertFalse(success)
-        # The actual implementation converts CalledProcessError to string
-        self.assertIn('Command', output)
-
-
-def run_tests():
-    """Run all tests and display results"""
-    print("=" * 60)
-    print("Running Hetzner Cloud Management Tool Tests")
-    print("=" * 60)
-    
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromTestCase(TestHetznerManager)
-    
-    # Run tests with detailed output
-    runner = unittest.TextTestRunner(verbosity=2, buffer=True)
-    result = runner.run(suite)
-    
-    # Print summary
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Success rate: {((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100):.1f}%")
-    
-    if result.failures:
-        print(f"\n{Colors.RED}FAILURES:{Colors.NC}")
-        for test, traceback in result.failures:
-            print(f"- {test}: {traceback.split('AssertionError: ')[-1].split('\\n')[0]}")
-    
-    if result.errors:
-        print(f"\n{Colors.RED}ERRORS:{Colors.NC}")
-        for test, traceback in result.errors:
-            error_lines = traceback.split('\n')
-            # Find the last non-empty line that contains error info
-            error_msg = "Unknown error"
-            for line in reversed(error_lines):
-                if line.strip() and not line.startswith('  '):
-                    error_msg = line.strip()
-                    break
-            print(f"- {test}: {error_msg}")
-    
-    if not result.failures and not result.errors:
-        print(f"\n{Colors.GREEN}🎉 All tests passed successfully!{Colors.NC}")
-    
-    return result.wasSuccessful()
-
-
-if __name__ == '__main__':
-    success = run_tests()
-    sys.exit(0 if success else 1)
+        assert result
+        mock_delete.assert_called_once_with('server-1', confirm=False, prefetched={'name': 'server-1'})
+
+
+@patch.object(HetznerManager, '_servers')
+@patch('builtins.input')
+def test_interactive_delete_multiple(mock_input, mock_servers, manager):
+    """Test selecting several servers deletes them as one batch"""
+    mock_servers.return_value = [{'name': 'server-1'}, {'name': 'server-2'}, {'name': 'server-3'}, {'name': 'server-4'}]
+    mock_input.return_value = '1,3-4'
+
+    with patch.object(manager, 'bulk_action', return_value=True) as mock_bulk:
+        result = manager.interactive_delete()
+
+    assert result
+    mock_bulk.assert_called_once_with(['server-1', 'server-3', 'server-4'], 'delete')
+
+
+@patch.object(HetznerManager, '_servers')
+@patch('builtins.input')
+def test_interactive_delete_invalid_selection(mock_input, mock_servers, manager):
+    """Test an out-of-range selection deletes nothing"""
+    mock_servers.return_value = [{'name': 'server-1'}, {'name': 'server-2'}]
+    mock_input.return_value = '1,5'
+
+    with patch.object(manager, 'delete_server') as mock_delete, \
+         patch.object(manager, 'bulk_action') as mock_bulk:
+        result = manager.interactive_delete()
+
+    assert not result
+    mock_delete.assert_not_called()
+    mock_bulk.assert_not_called()
+
+
+def test_parse_selection():
+    """Test comma and range selections map to zero-based indices"""
+    assert HetznerManager.parse_selection('2', 3) == [1]
+    assert HetznerManager.parse_selection('1, 3,5-7', 8) == [0, 2, 4, 5, 6]
+    assert HetznerManager.parse_selection('2,1-3', 3) == [1, 0, 2]
+    for selection in ('', 'a', '0', '4', '3-1', '1-'):
+        with pytest.raises(ValueError):
+            HetznerManager.parse_selection(selection, 3)
+
+
+@patch.object(HetznerManager, '_servers')
+@patch('builtins.input')
+def test_interactive_delete_cancelled(mock_input, mock_servers, manager):
+    """Test interactive server deletion cancelled"""
+    mock_servers.return_value = [{'name': 'server-1'}, {'name': 'server-2'}]
+    mock_input.return_value = '0'
+    
+    result = manager.interactive_delete()
+    
+    assert result  # Cancellation is considered successful
+
+
+@patch.object(HetznerManager, '_servers')
+def test_interactive_delete_no_servers(mock_servers, manager):
+    """Test interactive deletion with no servers"""
+    mock_servers.return_value = []
+    
+    result = manager.interactive_delete()
+    
+    assert result
+
+
+def test_colors_class():
+    """Test Colors class constants"""
+    assert hasattr(Colors, 'RED')
+    assert hasattr(Colors, 'GREEN')
+    assert hasattr(Colors, 'YELLOW')
+    assert hasattr(Colors, 'NC')
+    assert isinstance(Colors.RED, str)
+
+
+@patch.object(HetznerManager, 'list_servers', return_value=True)
+@patch.object(HetznerManager, 'has_token', return_value=True)
+@patch.object(HetznerManager, 'validate_token')
+@patch.object(HetznerManager, 'check_dependencies')
+def test_main_skips_startup_round_trips(mock_deps, mock_token, mock_has_token, mock_list):
+    """Test regular commands run without the hcloud startup checks"""
+    with patch('sys.argv', ['manage.py', 'list']):
+        result = manage.main()
+
+    assert result == 0
+    mock_deps.assert_not_called()
+    mock_token.assert_not_called()
+    mock_list.assert_called_once()
+
+
+@patch.object(HetznerManager, 'list_servers', return_value=True)
+@patch.object(HetznerManager, 'has_token', return_value=False)
+def test_main_stops_without_token(mock_has_token, mock_list):
+    """Test main exits before the command when no token is configured"""
+    with patch('sys.argv', ['manage.py', 'list']):
+        result = manage.main()
+
+    assert result == 1
+    mock_list.assert_not_called()
+
+
+def test_main_delete_reports_server_list_failure(fake_run, capsys):
+    """Test interactive delete surfaces hcloud's error and exits non-zero"""
+    fake_run.rc = 1
+    fake_run.err = b"hcloud: unable to authenticate your access token\n"
+    
+    with patch('sys.argv', ['manage.py', 'delete']), patch('builtins.input') as mock_input:
+        result = manage.main()
+    
+    assert result == 1
+    mock_input.assert_not_called()
+    output = capsys.readouterr().out
+    assert "unable to authenticate your access token" in output
+    assert "No servers found" not in output
+
+
+@patch.object(HetznerManager, 'validate_token', return_value=False)
+@patch.object(HetznerManager, 'check_dependencies', return_value=True)
+def test_main_doctor(mock_deps, mock_token):
+    """Test the doctor command runs both checks and reports failure"""
+    with patch('sys.argv', ['manage.py', 'doctor']):
+        result = manage.main()
+
+    assert result == 1
+    mock_deps.assert_called_once()
+    mock_token.assert_called_once()
+
+
+@patch.object(HetznerManager, 'has_token', return_value=True)
+def test_main_dispatches_through_command_table(mock_has_token):
+    """Test main routes subcommands and their arguments via COMMANDS"""
+    with patch.object(HetznerManager, 'resize_server', return_value=True) as mock_resize, \
+         patch('sys.argv', ['manage.py', 'resize', 'web-001', 'cpx31']):
+        result = manage.main()
+
+    assert result == 0
+    mock_resize.assert_called_once_with('web-001', 'cpx31')
+
+    with patch.object(HetznerManager, 'interactive_delete', return_value=True) as mock_interactive, \
+         patch('sys.argv', ['manage.py', 'delete']):
+        manage.main()
+
+    mock_interactive.assert_called_once()
+
+
+def test_run_hcloud_command_reports_stderr(fake_run, manager):
+    """Test failures fall back to stderr when hcloud prints nothing on stdout"""
+    fake_run.rc = 1
+    fake_run.err = b"hcloud: unable to authenticate your access token\n"
+
+    success, output = manager.run_hcloud_command(['server', 'list'])
+
+    assert not success
+    assert output == "hcloud: unable to authenticate your access token"
+
+# Error handling tests
+def test_run_hcloud_command_exception(fake_run, manager):
+    """Test hcloud command with subprocess exception"""
+    fake_run.exc = manage.subprocess.CalledProcessError(1, 'hcloud', 'error output')
+    
+    success, output = manager.run_hcloud_command(['test'])
+    
+    assert not success
+    # The actual implementation converts CalledProcessError to string
+    assert 'Command' in output
+